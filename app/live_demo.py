@@ -5,36 +5,43 @@ Professional news analysis platform for hackathon demonstration
 import streamlit as st
 import pandas as pd
 import numpy as np
-import requests
 import time
-import asyncio
-import aiohttp
 from datetime import datetime, timedelta
 import json
+import copy
 import sys
 from pathlib import Path
 import networkx as nx
 import plotly.graph_objects as go
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.append(str(project_root))
 
+from src.data_collection.importer import ImportStats, IncrementalDeduplicator, import_articles
+from src.data_collection.providers import ARTICLE_FIELDS, load_providers
+from src.analysis.knowledge_graph import NODE_KINDS, KnowledgeGraph
+from src.analysis.memory import format_bytes
+from src.analysis.relationships import LSA_METHOD
+from src.analysis.sparsify import DEFAULT_MAX_DEGREE
+from src.analysis.statistics import CorpusStatistics
+from src.export.reports import REPORT_FORMATS, render_report
+from src.jobs.queue import DONE, FAILED, QUEUED, RUNNING, JobQueue, frame_fingerprint
+from src.jobs.tasks import register_tasks
+from src.export.writers import (
+    ARTICLE_FORMATS, GRAPH_FORMATS, RELATIONSHIP_FORMATS,
+    export_articles, export_graph, export_relationships
+)
+
+EXPORT_DIR = project_root / "data" / "processed" / "exports"
+DEFAULT_MEMORY_LIMIT_GB = 4.0
+
 # Configure Streamlit
 st.set_page_config(
     page_title="NewsGraph - News Analysis Platform",
     layout="wide"
 )
 
-# API Keys
-API_KEYS = {
-    "newsapi": "d6cabf87c31d4de1acf3442348228cce",
-    "guardian": "cb8b4bf8-6fd5-42d6-bf65-ee02df92d6be", 
-    "newsdata": "pub_2ef38e6f49384427869f4be7ea315b15"
-}
-
 # Custom CSS
 st.markdown("""
 <style>
@@ -74,15 +81,21 @@ def main():
         
         # API Status
         st.subheader("API Status")
-        st.markdown('<div class="api-status">NewsAPI: Connected (1,000/day)</div>', unsafe_allow_html=True)
-        st.markdown('<div class="api-status">Guardian API: Connected (12,000/day)</div>', unsafe_allow_html=True)
-        st.markdown('<div class="api-status">NewsData API: Connected (200/day)</div>', unsafe_allow_html=True)
+        providers = get_providers()
+        for provider in providers:
+            quota = provider.quota()
+            allowance = f"{quota['daily_requests']:,} requests/day" if quota['daily_requests'] else "unmetered"
+            st.markdown(f'<div class="api-status">{provider.label}: Connected ({allowance})</div>', unsafe_allow_html=True)
         
         st.success("All APIs operational")
         
         st.markdown("---")
         st.markdown("**Daily Capacity:**")
-        st.markdown("- **Total**: 13,200 articles/day")
+        quotas = [q for q in (p.quota() for p in providers) if q['daily_requests']]
+        requests_per_day = sum(q['daily_requests'] for q in quotas)
+        articles_per_day = sum(q['daily_requests'] * q['max_page_size'] for q in quotas)
+        st.markdown(f"- **Requests**: {requests_per_day:,}/day")
+        st.markdown(f"- **Articles**: up to {articles_per_day:,}/day")
         st.markdown("- **Sources**: Multiple news outlets")
         st.markdown("- **Coverage**: Real-time collection")
     
@@ -106,6 +119,11 @@ def main():
     with tab4:
         show_analytics_dashboard()
 
+@st.cache_resource
+def get_providers():
+    """Provider adapters configured in config/providers.py"""
+    return load_providers()
+
 def show_data_collection():
     """Data collection interface"""
     st.header("News Data Collection")
@@ -118,16 +136,17 @@ def show_data_collection():
         search_query = st.text_input(
             "Search Query",
             placeholder="e.g., artificial intelligence, climate change, election 2024",
-            help="Enter specific keywords or phrases. Only articles containing these terms will be collected.",
+            help='Enter specific keywords or phrases. Only articles containing these terms will be collected. '
+                 'Supports "quoted phrases", +required and -excluded terms, and AND / OR / NOT.',
             key="tab1_data_collection_search"
         )
         
         days_back = st.slider(
             "Days to look back",
             min_value=1,
-            max_value=7,
+            max_value=30,
             value=3,
-            help="How many days back to search for articles",
+            help="How many days back to search for articles. For months or years of coverage, import an offline corpus below.",
             key="tab1_data_collection_days"
         )
     
@@ -141,7 +160,7 @@ def show_data_collection():
             key="tab1_data_collection_max_articles"
         )
         
-        st.info(f"**Will collect:** ~{max_articles * 3} articles")
+        st.info(f"**Will collect:** ~{max_articles * len(get_providers())} articles")
         st.success("**Precise Search:** Only articles matching your query will be collected")
     
     # Collection button
@@ -150,269 +169,212 @@ def show_data_collection():
             st.warning("Please enter a search query to collect relevant news articles")
             return
         
-        # Show what we're searching for
-        st.info(f"Searching for articles containing: **{search_query}**")
-            
-        with st.spinner("Collecting news from multiple sources... Please wait..."):
-            try:
-                # Collect news data
-                articles_data = collect_news(search_query, days_back, max_articles)
-                
-                if articles_data:
-                    # Store in session state
-                    st.session_state.articles_df = pd.DataFrame(articles_data)
-                    
-                    # Display results
-                    st.success(f"Successfully collected {len(articles_data)} articles matching your query")
-                    
-                    # Show summary
-                    col1, col2, col3, col4 = st.columns(4)
-                    with col1:
-                        st.metric("Total Articles", len(articles_data))
-                    with col2:
-                        sources = len(set([a['source_api'] for a in articles_data]))
-                        st.metric("API Sources", sources)
-                    with col3:
-                        unique_sources = len(set([a['source_name'] for a in articles_data]))
-                        st.metric("News Sources", unique_sources)
-                    with col4:
-                        st.metric("Search Term", f'"{search_query}"')
-                    
-                    # Show articles
-                    st.subheader("Collected Articles")
-                    for i, article in enumerate(articles_data[:5]):
-                        with st.expander(f"{article['title'][:80]}... ({article['source_api'].upper()})"):
-                            st.write(f"**Title:** {article['title']}")
-                            st.write(f"**Source:** {article['source_name']} via {article['source_api'].upper()}")
-                            st.write(f"**Published:** {article['published_at']}")
-                            st.write(f"**Description:** {article['description']}")
-                            if article.get('url'):
-                                st.write(f"**URL:** [Read Full Article]({article['url']})")
-                            
-                            if article.get('author'):
-                                st.write(f"**Author:** {article['author']}")
-                else:
-                    st.error("No articles found matching your search query. Try different keywords or check API limits.")
-                    
-            except Exception as e:
-                st.error(f"Collection failed: {str(e)}")
-                st.write("This might be due to API rate limits or network issues.")
-
-def collect_news(query, days_back, max_articles):
-    """Collect news from all three APIs"""
-    all_articles = []
-    
-    # Calculate date range
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=days_back)
-    from_date = start_date.strftime("%Y-%m-%d")
-    
-    # Progress tracking
-    progress_bar = st.progress(0)
-    status_text = st.empty()
-    
-    # 1. NewsAPI Collection
-    status_text.text("Collecting from NewsAPI...")
-    progress_bar.progress(10)
-    
-    try:
-        newsapi_articles = collect_from_newsapi(query, from_date, max_articles)
-        all_articles.extend(newsapi_articles)
-        st.write(f"NewsAPI: {len(newsapi_articles)} articles")
-    except Exception as e:
-        st.write(f"NewsAPI: {str(e)}")
-    
-    progress_bar.progress(40)
-    
-    # 2. Guardian API Collection
-    status_text.text("Collecting from Guardian API...")
-    
-    try:
-        guardian_articles = collect_from_guardian(query, from_date, max_articles)
-        all_articles.extend(guardian_articles)
-        st.write(f"Guardian API: {len(guardian_articles)} articles")
-    except Exception as e:
-        st.write(f"Guardian API: {str(e)}")
-    
-    progress_bar.progress(70)
-    
-    # 3. NewsData API Collection
-    status_text.text("Collecting from NewsData API...")
-    
-    try:
-        newsdata_articles = collect_from_newsdata(query, max_articles)
-        all_articles.extend(newsdata_articles)
-        st.write(f"NewsData API: {len(newsdata_articles)} articles")
-    except Exception as e:
-        st.write(f"NewsData API: {str(e)}")
-    
-    progress_bar.progress(100)
-    status_text.text("Collection completed")
-    
-    # Remove duplicates based on title similarity
-    unique_articles = remove_duplicates(all_articles)
-    
-    return unique_articles
-
-def collect_from_newsapi(query, from_date, max_articles):
-    """Collect from NewsAPI with strict query filtering"""
-    url = "https://newsapi.org/v2/everything"
-    params = {
-        "q": f'"{query}"',  # Use quotes for exact phrase matching
-        "from": from_date,
-        "sortBy": "relevancy",  # Sort by relevancy instead of publishedAt
-        "pageSize": min(max_articles, 100),
-        "apiKey": API_KEYS["newsapi"],
-        "language": "en"
-    }
+        # Collection runs on the shared worker pool; identical queries share one job
+        from_date = (datetime.now() - timedelta(days=days_back)).strftime("%Y-%m-%d")
+        providers = get_providers()
+        st.session_state.collection_job = get_job_queue().submit(
+            "collection",
+            {
+                "query": search_query,
+                "from_date": from_date,
+                "max_articles": max_articles,
+                "providers": [provider.label for provider in providers]
+            },
+            payload={
+                "query": search_query,
+                "from_date": from_date,
+                "max_articles": max_articles,
+                "providers": providers
+            }
+        )
+        st.session_state.collection_query = search_query
     
-    response = requests.get(url, params=params, timeout=10)
+    track_job("collection_job", apply_collection_result, "Collection failed",
+              hint="This might be due to API rate limits or network issues.")
+    show_collection_results()
     
-    if response.status_code == 200:
-        data = response.json()
-        articles = []
-        
-        for article in data.get("articles", []):
-            if article.get("title") and article.get("description"):
-                # Filter articles to ensure they contain the query terms
-                if is_relevant_article(article, query):
-                    articles.append({
-                        "title": article["title"],
-                        "description": article["description"],
-                        "source_name": article.get("source", {}).get("name", "Unknown"),
-                        "source_api": "newsapi",
-                        "published_at": article.get("publishedAt", ""),
-                        "url": article.get("url", ""),
-                        "author": article.get("author", ""),
-                        "content": article.get("content", "")
-                    })
-        
-        return articles
-    else:
-        raise Exception(f"NewsAPI error: {response.status_code}")
-
-def collect_from_guardian(query, from_date, max_articles):
-    """Collect from Guardian API with strict query filtering"""
-    url = "https://content.guardianapis.com/search"
-    params = {
-        "q": f'"{query}"',  # Use quotes for exact phrase matching
-        "from-date": from_date,
-        "order-by": "relevance",  # Sort by relevance instead of newest
-        "page-size": min(max_articles, 50),
-        "api-key": API_KEYS["guardian"],
-        "show-fields": "trailText,byline,bodyText"
-    }
+    show_corpus_import()
+
+def apply_collection_result(result):
+    """Make freshly collected articles current"""
+    st.session_state.last_collection = dict(result, query=st.session_state.get('collection_query', ''))
+    if result['articles']:
+        store_articles(pd.DataFrame(result['articles']))
+
+def show_collection_results():
+    """Summary of the most recent collection"""
+    collection = st.session_state.get('last_collection')
+    if not collection:
+        return
     
-    response = requests.get(url, params=params, timeout=10)
+    articles_data = collection['articles']
+    search_query = collection['query']
     
-    if response.status_code == 200:
-        data = response.json()
-        articles = []
-        
-        for article in data.get("response", {}).get("results", []):
-            fields = article.get("fields", {})
-            article_data = {
-                "title": article.get("webTitle", ""),
-                "description": fields.get("trailText", ""),
-                "content": fields.get("bodyText", "")
-            }
+    for entry in collection['report']:
+        if entry['error'] and entry['count']:
+            st.write(f"{entry['label']}: {entry['count']} articles (stopped early: {entry['error']})")
+        elif entry['error']:
+            st.write(f"{entry['label']}: {entry['error']}")
+        else:
+            st.write(f"{entry['label']}: {entry['count']} articles")
+    
+    if not articles_data:
+        st.error("No articles found matching your search query. Try different keywords or check API limits.")
+        return
+    
+    # Display results
+    st.success(f"Successfully collected {len(articles_data)} articles matching your query")
+    
+    # Show summary
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Total Articles", len(articles_data))
+    with col2:
+        sources = len(set([a['source_api'] for a in articles_data]))
+        st.metric("API Sources", sources)
+    with col3:
+        unique_sources = len(set([a['source_name'] for a in articles_data]))
+        st.metric("News Sources", unique_sources)
+    with col4:
+        st.metric("Search Term", f'"{search_query}"')
+    
+    # Show articles
+    st.subheader("Collected Articles")
+    for i, article in enumerate(articles_data[:5]):
+        with st.expander(f"{article['title'][:80]}... ({article['source_api'].upper()})"):
+            st.write(f"**Title:** {article['title']}")
+            st.write(f"**Source:** {article['source_name']} via {article['source_api'].upper()}")
+            st.write(f"**Published:** {article['published_at']}")
+            st.write(f"**Description:** {article['description']}")
+            if article.get('url'):
+                st.write(f"**URL:** [Read Full Article]({article['url']})")
             
-            # Filter articles to ensure they contain the query terms
-            if is_relevant_article(article_data, query):
-                articles.append({
-                    "title": article.get("webTitle", ""),
-                    "description": fields.get("trailText", ""),
-                    "source_name": "The Guardian",
-                    "source_api": "guardian",
-                    "published_at": article.get("webPublicationDate", ""),
-                    "url": article.get("webUrl", ""),
-                    "author": fields.get("byline", ""),
-                    "content": fields.get("bodyText", "")
-                })
-        
-        return articles
-    else:
-        raise Exception(f"Guardian API error: {response.status_code}")
-
-def collect_from_newsdata(query, max_articles):
-    """Collect from NewsData API with strict query filtering"""
-    url = "https://newsdata.io/api/1/news"
-    params = {
-        "q": f'"{query}"',  # Use quotes for exact phrase matching
-        "language": "en",
-        "size": min(max_articles, 50),
-        "apikey": API_KEYS["newsdata"]
-    }
+            if article.get('author'):
+                st.write(f"**Author:** {article['author']}")
+
+def show_corpus_import():
+    """Bulk import of offline article dumps"""
+    st.markdown("---")
+    st.subheader("Import Offline Corpus")
+    st.write("Load large research corpora or previous exports (JSONL, CSV or Parquet) without using API quota")
     
-    response = requests.get(url, params=params, timeout=10)
+    col1, col2 = st.columns(2)
     
-    if response.status_code == 200:
-        data = response.json()
-        articles = []
-        
-        for article in data.get("results", []):
-            if article.get("title") and article.get("description"):
-                # Filter articles to ensure they contain the query terms
-                if is_relevant_article(article, query):
-                    articles.append({
-                        "title": article["title"],
-                        "description": article["description"],
-                        "source_name": article.get("source_id", "Unknown"),
-                        "source_api": "newsdata",
-                        "published_at": article.get("pubDate", ""),
-                        "url": article.get("link", ""),
-                        "author": ", ".join(article.get("creator", [])) if article.get("creator") else "",
-                        "content": article.get("content", "")
-                    })
-        
-        return articles
-    else:
-        raise Exception(f"NewsData API error: {response.status_code}")
-
-def is_relevant_article(article, query):
-    """Check if article is relevant to the search query"""
-    if not query or not query.strip():
-        return True
-    
-    # Convert query to lowercase and split into terms
-    query_terms = [term.strip().lower() for term in query.lower().split()]
-    
-    # Combine article text for searching
-    article_text = f"{article.get('title', '')} {article.get('description', '')} {article.get('content', '')}"
-    article_text = article_text.lower()
-    
-    # Check if at least 70% of query terms are present in the article
-    matching_terms = 0
-    for term in query_terms:
-        if len(term) > 2 and term in article_text:  # Ignore very short terms
-            matching_terms += 1
-    
-    # Require at least 70% of terms to match (or all terms if query has 3 or fewer terms)
-    required_matches = max(1, int(len(query_terms) * 0.7))
-    if len(query_terms) <= 3:
-        required_matches = len(query_terms)
-    
-    return matching_terms >= required_matches
-
-def remove_duplicates(articles):
-    """Remove duplicate articles based on title similarity"""
-    unique_articles = []
-    seen_titles = set()
-    
-    for article in articles:
-        title_lower = article["title"].lower()
-        # Simple deduplication - check if similar title exists
-        is_duplicate = False
-        for seen_title in seen_titles:
-            if len(set(title_lower.split()) & set(seen_title.split())) > len(title_lower.split()) * 0.7:
-                is_duplicate = True
-                break
+    with col1:
+        uploaded_file = st.file_uploader(
+            "Upload a dump",
+            type=["jsonl", "json", "ndjson", "csv", "parquet", "gz", "bz2", "xz"],
+            key="tab1_import_upload"
+        )
+        dump_path = st.text_input(
+            "...or a path on the server",
+            placeholder="data/raw/articles.jsonl.gz",
+            help="Use a server-side path for dumps larger than the upload limit",
+            key="tab1_import_path"
+        )
+    
+    with col2:
+        import_limit = st.number_input(
+            "Maximum articles (0 = all)",
+            min_value=0,
+            value=0,
+            step=10000,
+            key="tab1_import_limit"
+        )
+        append = st.checkbox(
+            "Append to current articles",
+            value=False,
+            key="tab1_import_append"
+        )
+    
+    if st.button("Import Corpus", key="tab1_import_btn"):
+        source = uploaded_file if uploaded_file is not None else dump_path.strip()
+        if not source:
+            st.warning("Please upload a file or enter a path to import")
+            return
         
-        if not is_duplicate:
-            unique_articles.append(article)
-            seen_titles.add(title_lower)
+        with st.spinner("Importing articles..."):
+            try:
+                stats = ImportStats()
+                appending = append and 'articles_df' in st.session_state
+                # Fold chunks into a copy; the stored statistics only change once the import succeeds
+                corpus_stats = copy.deepcopy(get_corpus_stats()) if appending else CorpusStatistics()
+                # Appended rows are also deduplicated against the current corpus
+                deduplicator = IncrementalDeduplicator.from_articles(st.session_state.articles_df) if appending \
+                    else IncrementalDeduplicator()
+                status_text = st.empty()
+                chunks = []
+                for chunk in import_articles(source, limit=import_limit or None, deduplicator=deduplicator,
+                                             stats=stats):
+                    chunks.append(chunk)
+                    corpus_stats.add_articles(chunk)
+                    status_text.text(f"Read {stats.rows_read:,} rows, imported {stats.imported:,} articles")
+                
+                if not chunks:
+                    st.error("No usable articles found in the file")
+                    return
+                
+                imported_df = pd.concat(chunks, ignore_index=True)
+                if appending:
+                    imported_df = pd.concat([st.session_state.articles_df, imported_df], ignore_index=True)
+                store_articles(imported_df, corpus_stats)
+                
+                st.success(f"Imported {stats.imported:,} articles "
+                           f"({stats.duplicates:,} duplicates and {stats.rows_skipped:,} untitled rows skipped)")
+            except Exception as e:
+                st.error(f"Import failed: {str(e)}")
+
+def store_articles(articles_df, corpus_stats=None):
+    """Make a new corpus current, with its precomputed statistics"""
+    st.session_state.articles_df = articles_df
+    st.session_state.corpus_stats = corpus_stats or CorpusStatistics.from_articles(articles_df)
+    # Relationships and entity postings index into the previous corpus
+    st.session_state.corpus_stats.reset_relationships()
+    st.session_state.pop('relationships', None)
+    st.session_state.pop('entity_index', None)
+    st.session_state.pop('knowledge_graph', None)
+    st.session_state.pop('analysis_job', None)
+    st.session_state.pop('analysis_peak_rss', None)
+    st.session_state.pop('analysis_reused', None)
+
+def get_corpus_stats():
+    """Statistics for the current corpus, built on first use"""
+    if 'corpus_stats' not in st.session_state:
+        st.session_state.corpus_stats = CorpusStatistics.from_articles(st.session_state.articles_df)
+    return st.session_state.corpus_stats
+
+@st.cache_resource
+def get_job_queue():
+    """Worker pool and job registry shared by every session"""
+    return register_tasks(JobQueue())
+
+def track_job(state_key, on_complete, failure_message, hint=None):
+    """Follow a background job stored in session state until it finishes"""
+    job_id = st.session_state.get(state_key)
+    if job_id is None:
+        return
     
-    return unique_articles
+    queue = get_job_queue()
+    status = queue.status(job_id)
+    if status is None or status['status'] == FAILED:
+        del st.session_state[state_key]
+        st.error(f"{failure_message}: {status['message'] if status else 'job lost'}")
+        if hint:
+            st.write(hint)
+    elif status['status'] == DONE:
+        del st.session_state[state_key]
+        on_complete(queue.result(job_id))
+    else:
+        show_job_progress(job_id)
+
+@st.fragment(run_every=1.0)
+def show_job_progress(job_id):
+    """Progress bar that polls the job without rerunning the whole page"""
+    status = get_job_queue().status(job_id)
+    if status and status['status'] in (QUEUED, RUNNING):
+        st.progress(status['progress'], text=status['message'] or status['status'])
+    else:
+        st.rerun()
 
 def show_analysis():
     """Relationship analysis interface"""
@@ -442,141 +404,192 @@ def show_analysis():
     with col2:
         analysis_methods = st.multiselect(
             "Analysis Methods",
-            ["Keyword Overlap", "Source Cross-reference", "Temporal Proximity", "Content Similarity"],
-            default=["Keyword Overlap", "Content Similarity"]
+            ["Keyword Overlap", "Source Cross-reference", "Temporal Proximity", "Content Similarity",
+             LSA_METHOD, "Entity Overlap"],
+            default=["Keyword Overlap", "Content Similarity"],
+            help=f"{LSA_METHOD} matches paraphrased headlines through latent topics and scales to larger corpora"
         )
     
+    date_range = show_time_partition_options()
+    pruning = show_pruning_options()
+    memory_limit = show_memory_options()
+    
     # Analysis button
     if st.button("Run Analysis", type="primary"):
-        with st.spinner("Analyzing relationships in news data..."):
-            # Processing time
-            time.sleep(3)
-            
-            relationships = analyze_relationships(articles_df, similarity_threshold, analysis_methods)
-            
-            # Store results
-            st.session_state.relationships = relationships
-            
-            # Display results
-            st.success("Analysis completed")
-            
-            # Show metrics
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                st.metric("Articles Analyzed", len(articles_df))
-            
-            with col2:
-                st.metric("Relationships Found", len(relationships))
-            
-            with col3:
-                density = len(relationships) / (len(articles_df) * (len(articles_df) - 1) / 2) if len(articles_df) > 1 else 0
-                st.metric("Network Density", f"{density:.3f}")
-            
-            with col4:
-                if relationships:
-                    avg_strength = sum(r['strength'] for r in relationships) / len(relationships)
-                    st.metric("Avg Strength", f"{avg_strength:.3f}")
-                else:
-                    st.metric("Avg Strength", "0.000")
-            
-            # Show relationship analysis
-            if relationships:
-                st.subheader("Discovered Relationships")
-                
-                # Group by relationship type
-                rel_types = {}
-                for rel in relationships:
-                    rel_type = rel['type']
-                    if rel_type not in rel_types:
-                        rel_types[rel_type] = []
-                    rel_types[rel_type].append(rel)
-                
-                # Display by type
-                for rel_type, rels in rel_types.items():
-                    with st.expander(f"{rel_type} ({len(rels)} relationships)"):
-                        for i, rel in enumerate(rels[:3]):  # Show top 3
-                            st.write(f"**Connection {i+1}:**")
-                            st.write(f"• Article 1: {rel['article1_title'][:60]}...")
-                            st.write(f"• Article 2: {rel['article2_title'][:60]}...")
-                            st.write(f"• Strength: {rel['strength']:.3f}")
-                            st.write(f"• Evidence: {rel['evidence']}")
-                            st.write("---")
-            else:
-                st.info("No strong relationships found. Try lowering the similarity threshold.")
-
-def analyze_relationships(articles_df, threshold, methods):
-    """Analyze relationships in news data"""
-    relationships = []
-    articles = articles_df.to_dict('records')
-    
-def analyze_relationships(articles_df, threshold, methods):
-    """Analyze relationships using TF-IDF and Cosine Similarity"""
-    relationships = []
-    articles = articles_df.to_dict('records')
-    
-    # Prepare text corpus (Title + Description + Content)
-    corpus = []
-    for article in articles:
-        text = f"{article['title']} {article['description']} {article.get('content', '')}"
-        corpus.append(text)
-    
-    # TF-IDF Vectorization
-    try:
-        vectorizer = TfidfVectorizer(stop_words='english', max_features=5000)
-        tfidf_matrix = vectorizer.fit_transform(corpus)
+        st.session_state.analysis_submitted_at = time.time()
+        st.session_state.analysis_job = get_job_queue().submit(
+            "analysis",
+            {
+                "articles": frame_fingerprint(articles_df, ARTICLE_FIELDS),
+                "threshold": similarity_threshold,
+                "methods": sorted(analysis_methods),
+                "date_range": [str(day) for day in date_range] if date_range else None,
+                "pruning": pruning,
+                "memory_limit": memory_limit
+            },
+            payload={
+                "articles_df": articles_df,
+                "threshold": similarity_threshold,
+                "methods": analysis_methods,
+                "date_range": date_range,
+                "pruning": pruning,
+                "memory_limit": memory_limit
+            }
+        )
+    
+    track_job("analysis_job", apply_analysis_result, "Analysis failed")
+    
+    if 'relationships' in st.session_state:
+        show_analysis_results(articles_df, st.session_state.relationships)
+
+def apply_analysis_result(result):
+    """Store a finished analysis and refresh the graph statistics"""
+    relationships = result['relationships']
+    for warning in result['warnings']:
+        st.warning(warning)
+    
+    # Store results
+    st.session_state.relationships = relationships
+    st.session_state.pop('knowledge_graph', None)
+    if result['entity_index'] is not None:
+        st.session_state.entity_index = result['entity_index']
+        st.write(f"Extracted {len(result['entity_index'])} distinct entities")
+    corpus_stats = get_corpus_stats()
+    corpus_stats.reset_relationships()
+    corpus_stats.add_relationships(relationships)
+    
+    st.session_state.analysis_peak_rss = result.get('peak_rss')
+    # An identical earlier job's result is reused as is, along with its measurement
+    st.session_state.analysis_reused = result.get('finished_at', 0) < st.session_state.get('analysis_submitted_at', 0)
+    
+    st.success("Analysis completed")
+
+def show_analysis_results(articles_df, relationships):
+    """Metrics and top relationships of the current analysis"""
+    corpus_stats = get_corpus_stats()
+    
+    # Show metrics
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("Articles Analyzed", len(articles_df))
+    
+    with col2:
+        st.metric("Relationships Found", len(relationships))
+    
+    with col3:
+        st.metric("Network Density", f"{corpus_stats.density:.3f}")
+    
+    with col4:
+        st.metric("Avg Strength", f"{corpus_stats.avg_strength:.3f}")
+    
+    if st.session_state.get('analysis_peak_rss'):
+        if st.session_state.get('analysis_reused'):
+            st.caption(f"Reused an earlier identical analysis; peak memory during that run: "
+                       f"{format_bytes(st.session_state.analysis_peak_rss)}")
+        else:
+            st.caption(f"Peak memory during analysis: {format_bytes(st.session_state.analysis_peak_rss)}")
+    
+    # Show relationship analysis
+    if relationships:
+        st.subheader("Discovered Relationships")
         
-        # Calculate Cosine Similarity Matrix
-        cosine_sim = cosine_similarity(tfidf_matrix, tfidf_matrix)
+        # Group by relationship type
+        rel_types = {}
+        for rel in relationships:
+            rel_type = rel['type']
+            if rel_type not in rel_types:
+                rel_types[rel_type] = []
+            rel_types[rel_type].append(rel)
         
-        # Extract relationships
-        for i in range(len(articles)):
-            # Get top related articles for article i
-            # We want to ensure at least some connections, so we might take top 2 regardless of threshold if they are decent
-            scores = list(enumerate(cosine_sim[i]))
-            scores = sorted(scores, key=lambda x: x[1], reverse=True)
-            
-            # Skip self (index 0 is self because sorted desc)
-            for j, score in scores[1:]: 
-                if j <= i: continue # Avoid duplicates (undirected)
-                
-                # Check threshold or forced connection (top 1-2 matches even if weak, for the "chain" effect)
-                is_top_match = score > 0.15 # Lower "chain" threshold
-                
-                if score >= threshold or is_top_match:
-                    article1 = articles[i]
-                    article2 = articles[j]
-                    
-                    # Determine evidence (shared top keywords)
-                    feature_names = vectorizer.get_feature_names_out()
-                    # simplistic extraction of top shared words
-                    # (In a real app, we'd multiply vector i * vector j to find contributing terms)
-                    
-                    evidence = f"Similarity Score: {score:.2f}"
-                    
-                    relationships.append({
-                        "article1_id": i,
-                        "article2_id": j,
-                        "article1_title": article1['title'],
-                        "article2_title": article2['title'],
-                        "article1_source": article1['source_name'],
-                        "article2_source": article2['source_name'],
-                        "article1_date": article1.get('published_at', ''),
-                        "article2_date": article2.get('published_at', ''),
-                        "type": "Content Similarity",
-                        "strength": float(score),
-                        "evidence": evidence,
-                        "method": "TF-IDF & Cosine Similarity"
-                    })
-                    
-    except Exception as e:
-        st.error(f"Analysis failed: {str(e)}")
-        # Fallback?
-    
-    # Sort by strength
-    relationships.sort(key=lambda x: x['strength'], reverse=True)
-    
-    return relationships
+        # Display by type
+        for rel_type, rels in rel_types.items():
+            with st.expander(f"{rel_type} ({len(rels)} relationships)"):
+                for i, rel in enumerate(rels[:3]):  # Show top 3
+                    st.write(f"**Connection {i+1}:**")
+                    st.write(f"• Article 1: {rel['article1_title'][:60]}...")
+                    st.write(f"• Article 2: {rel['article2_title'][:60]}...")
+                    st.write(f"• Strength: {rel['strength']:.3f}")
+                    st.write(f"• Evidence: {rel['evidence']}")
+                    st.write("---")
+    else:
+        st.info("No strong relationships found. Try lowering the similarity threshold.")
+
+def show_pruning_options():
+    """Edge budget settings passed to the sparsification stage"""
+    with st.expander("Graph Pruning"):
+        max_degree = st.slider(
+            "Max links per article",
+            min_value=1,
+            max_value=20,
+            value=DEFAULT_MAX_DEGREE,
+            help="No article gets more than this many links (backbone links aside), "
+                 "so the graph grows linearly with the corpus"
+        )
+        backbone = st.checkbox(
+            "Keep story backbone",
+            value=True,
+            help="Add back the strongest links above the threshold that keep each story connected"
+        )
+        use_disparity = st.checkbox(
+            "Disparity filter",
+            value=False,
+            help="Drop links that are not significant for either article given its other links"
+        )
+        alpha = st.select_slider("Significance level", options=[0.01, 0.05, 0.1, 0.2], value=0.05,
+                                 disabled=not use_disparity)
+    return {"max_degree": max_degree, "backbone": backbone, "disparity_alpha": alpha if use_disparity else None}
+
+def show_memory_options():
+    """Optional RAM ceiling for the analysis, in bytes"""
+    with st.expander("Memory Budget"):
+        bounded = st.checkbox(
+            "Memory-bounded mode",
+            value=False,
+            help="Size similarity blocks to a RAM ceiling and run entity extraction in small batches "
+                 "in one process. Large corpora run slower instead of exhausting memory."
+        )
+        ceiling = st.number_input("RAM ceiling (GB)", min_value=0.5, max_value=512.0,
+                                  value=DEFAULT_MEMORY_LIMIT_GB, step=0.5, disabled=not bounded)
+    return int(ceiling * 1024 ** 3) if bounded else None
+
+def show_time_partition_options():
+    """Long-horizon options; returns (start, end) when weekly shards should be used"""
+    corpus_stats = get_corpus_stats()
+    if corpus_stats.date_min is None:
+        return None
+    
+    first_day, last_day = corpus_stats.date_min.date(), corpus_stats.date_max.date()
+    span_weeks = (last_day - first_day).days / 7
+    
+    with st.expander(f"Long-horizon analysis ({first_day} to {last_day})", expanded=span_weeks > 4):
+        use_shards = st.checkbox(
+            "Time-partitioned analysis (weekly shards)",
+            value=span_weeks > 4,
+            help="Compare articles within each week and with the adjacent weeks only. "
+                 "Past weeks are cached on disk and reused by later runs.",
+            key="tab2_time_partitioned"
+        )
+        selected = st.date_input(
+            "Date range",
+            value=(first_day, last_day),
+            min_value=first_day,
+            max_value=last_day,
+            disabled=not use_shards,
+            key="tab2_date_range"
+        )
+        undated = corpus_stats.total_articles - sum(corpus_stats.by_date.values())
+        if undated:
+            st.caption(f"{undated:,} articles have no publication date and are left out of "
+                       f"time-partitioned analysis")
+    
+    if not use_shards:
+        return None
+    if isinstance(selected, (tuple, list)):
+        if len(selected) == 2:
+            return selected[0], selected[1]
+        return (selected[0], selected[0]) if selected else (first_day, last_day)
+    return selected, selected
 
 def show_network_visualization():
     """Network visualization using Plotly"""
@@ -620,14 +633,11 @@ def show_network_visualization():
                    date=article.get('published_at', 'Unknown'),
                    label=date_label)
     
-    # Add edges (relationships)
+    # Add edges (relationships are already pruned to a bounded budget)
     for rel in relationships:
-        # Show edges more aggressively to ensure connections are visible
-        # If score > 0.15 (our low chain threshold), we show it
-        if rel['strength'] > 0.15:
-            G.add_edge(rel['article1_id'], rel['article2_id'], 
-                       weight=rel['strength'], 
-                       evidence=rel['evidence'])
+        G.add_edge(rel['article1_id'], rel['article2_id'], 
+                   weight=rel['strength'], 
+                   evidence=rel['evidence'])
     
     # Calculate layout - Force Directed
     pos = nx.spring_layout(G, k=0.8, iterations=100) # Increased k for more spread, iterations for stability
@@ -739,6 +749,69 @@ def show_network_visualization():
                 """, unsafe_allow_html=True)
                 st.caption(f"Reason: {rel['evidence']}")
                 st.divider()
+    
+    show_graph_explorer(articles_df, relationships)
+
+def get_knowledge_graph(articles_df, relationships):
+    """Knowledge graph for the current analysis, built once per analysis run"""
+    if 'knowledge_graph' not in st.session_state:
+        st.session_state.knowledge_graph = KnowledgeGraph.from_corpus(
+            articles_df, relationships, st.session_state.get('entity_index')
+        )
+    return st.session_state.knowledge_graph
+
+def pick_graph_node(graph, label, key):
+    """Search box + selector for one graph node"""
+    text = st.text_input(label, placeholder="article title, entity or source", key=f"{key}_search")
+    matches = graph.find(text) if text else []
+    if text and not matches:
+        st.caption("No matching nodes")
+    return st.selectbox(
+        "Matches",
+        matches,
+        format_func=lambda node: f"[{graph.kind(node)}] {graph.labels[node][:80]}",
+        key=f"{key}_select"
+    ) if matches else None
+
+def show_graph_explorer(articles_df, relationships):
+    """Interactive neighbourhood and path lookups on the knowledge graph"""
+    st.subheader("Knowledge Graph Explorer")
+    graph = get_knowledge_graph(articles_df, relationships)
+    st.caption(f"{graph.num_nodes:,} nodes (articles, entities, sources) and {graph.num_edges:,} edges")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("#### Neighbourhood")
+        node = pick_graph_node(graph, "Find a node", "tab3_neighbourhood")
+        hops = st.slider("Hops", min_value=1, max_value=4, value=2, key="tab3_neighbourhood_hops")
+        kinds = st.multiselect("Show", list(NODE_KINDS), default=list(NODE_KINDS), key="tab3_neighbourhood_kinds")
+        if node is not None:
+            started = time.perf_counter()
+            neighbourhood = graph.neighborhood(node, k=hops, kinds=kinds, max_nodes=500)
+            elapsed = (time.perf_counter() - started) * 1000
+            st.write(f"{len(neighbourhood)} nodes within {hops} hops ({elapsed:.1f} ms)")
+            st.dataframe(pd.DataFrame([
+                {"hops": hop, "kind": graph.kind(n), "label": graph.labels[n]}
+                for n, hop in neighbourhood.items()
+            ]), hide_index=True)
+    
+    with col2:
+        st.markdown("#### How are X and Y connected?")
+        source_node = pick_graph_node(graph, "From", "tab3_path_from")
+        target_node = pick_graph_node(graph, "To", "tab3_path_to")
+        if source_node is not None and target_node is not None:
+            started = time.perf_counter()
+            steps = graph.connection(source_node, target_node)
+            elapsed = (time.perf_counter() - started) * 1000
+            if steps is None:
+                st.info("These nodes are not connected")
+            else:
+                st.write(f"Path of {len(steps) - 1} steps ({elapsed:.1f} ms)")
+                for step in steps:
+                    if 'edge_type' in step:
+                        st.markdown(f"⬇️ *{step['edge_type'].replace('_', ' ')}*")
+                    st.markdown(f"**[{step['kind']}]** {step['label']}")
 
 def show_analytics_dashboard():
     """Analytics dashboard"""
@@ -751,6 +824,7 @@ def show_analytics_dashboard():
     
     articles_df = st.session_state.articles_df
     relationships = st.session_state.get('relationships', [])
+    corpus_stats = get_corpus_stats()
     
     # Key insights
     st.subheader("Key Insights")
@@ -759,19 +833,17 @@ def show_analytics_dashboard():
     
     with col1:
         st.markdown("#### Collection Statistics")
-        st.write(f"**Total Articles:** {len(articles_df)}")
-        st.write(f"**API Sources:** {articles_df['source_api'].nunique()}")
-        st.write(f"**News Sources:** {articles_df['source_name'].nunique()}")
+        st.write(f"**Total Articles:** {corpus_stats.total_articles}")
+        st.write(f"**API Sources:** {corpus_stats.api_count}")
+        st.write(f"**News Sources:** {corpus_stats.source_count}")
         
-        if relationships:
-            st.write(f"**Relationships:** {len(relationships)}")
-            avg_strength = sum(r['strength'] for r in relationships) / len(relationships)
-            st.write(f"**Avg Connection Strength:** {avg_strength:.3f}")
+        if corpus_stats.total_relationships:
+            st.write(f"**Relationships:** {corpus_stats.total_relationships}")
+            st.write(f"**Avg Connection Strength:** {corpus_stats.avg_strength:.3f}")
     
     with col2:
         st.markdown("#### Top News Sources")
-        source_counts = articles_df['source_name'].value_counts().head(5)
-        for source, count in source_counts.items():
+        for source, count in corpus_stats.by_source.most_common(5):
             st.write(f"**{source}**: {count} articles")
     
     # API distribution
@@ -781,140 +853,68 @@ def show_analytics_dashboard():
     
     with col1:
         st.write("**Articles by API:**")
-        api_counts = articles_df['source_api'].value_counts()
+        api_counts = pd.Series(dict(corpus_stats.by_api.most_common()))
         st.bar_chart(api_counts)
     
     with col2:
         st.write("**Timeline Distribution:**")
-        if not articles_df.empty:
-            articles_df['published_at'] = pd.to_datetime(articles_df['published_at'], errors='coerce')
-            timeline_data = articles_df.dropna(subset=['published_at']).groupby(
-                articles_df['published_at'].dt.date
-            ).size()
-            if not timeline_data.empty:
-                st.line_chart(timeline_data)
+        timeline_data = corpus_stats.timeline()
+        if not timeline_data.empty:
+            st.line_chart(timeline_data)
     
     # Export data
     st.subheader("Export Data")
+    st.caption(f"Exports are streamed to {EXPORT_DIR.relative_to(project_root)} and offered for download")
     
-    col1, col2, col3 = st.columns(3)
+    col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        if st.button("Export Articles CSV"):
-            csv = articles_df.to_csv(index=False)
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            st.download_button(
-                label="Download Articles",
-                data=csv,
-                file_name=f"news_articles_{timestamp}.csv",
-                mime="text/csv"
-            )
+        article_format = st.selectbox("Articles format", list(ARTICLE_FORMATS), key="tab4_article_format")
+        if st.button("Export Articles"):
+            suffix, mime = ARTICLE_FORMATS[article_format]
+            path = export_path("news_articles", suffix)
+            export_articles(articles_df, path, fmt=suffix.split(".")[0])
+            offer_download("Download Articles", path, mime)
     
     with col2:
-        if relationships and st.button("Export Relationships CSV"):
-            rel_df = pd.DataFrame(relationships)
-            csv = rel_df.to_csv(index=False)
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            st.download_button(
-                label="Download Relationships",
-                data=csv,
-                file_name=f"news_relationships_{timestamp}.csv",
-                mime="text/csv"
-            )
+        relationship_format = st.selectbox("Relationships format", list(RELATIONSHIP_FORMATS), key="tab4_relationship_format")
+        if relationships and st.button("Export Relationships"):
+            suffix, mime = RELATIONSHIP_FORMATS[relationship_format]
+            path = export_path("news_relationships", suffix)
+            export_relationships(relationships, path, fmt=suffix.split(".")[0])
+            offer_download("Download Relationships", path, mime)
     
     with col3:
+        graph_format = st.selectbox("Graph format", list(GRAPH_FORMATS), key="tab4_graph_format")
+        if relationships and st.button("Export Graph"):
+            suffix, mime = GRAPH_FORMATS[graph_format]
+            path = export_path("news_graph", suffix)
+            export_graph(articles_df, relationships, path, suffix)
+            offer_download("Download Graph", path, mime)
+    
+    with col4:
+        report_format = st.selectbox("Report format", list(REPORT_FORMATS), key="tab4_report_format")
         if st.button("Export Full Report"):
-            report = generate_report(articles_df, relationships)
+            suffix, mime = REPORT_FORMATS[report_format]
+            report = render_report(corpus_stats, suffix)
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             st.download_button(
                 label="Download Report",
                 data=report,
-                file_name=f"news_analysis_{timestamp}.txt",
-                mime="text/plain"
+                file_name=f"news_analysis_{timestamp}.{suffix}",
+                mime=mime
             )
 
-def generate_report(articles_df, relationships):
-    """Generate analysis report"""
-    
-    report = f"""NewsGraph Analysis Report
-========================
-Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-Data Source: News APIs (NewsAPI, Guardian, NewsData)
-
-COLLECTION SUMMARY
-==================
-Total Articles Collected: {len(articles_df)}
-API Sources Used: {articles_df['source_api'].nunique()}
-Unique News Sources: {articles_df['source_name'].nunique()}
-Collection Period: {articles_df['published_at'].min()} to {articles_df['published_at'].max()}
+def export_path(prefix, suffix):
+    """Timestamped file in the export directory"""
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    return EXPORT_DIR / f"{prefix}_{timestamp}.{suffix}"
 
-API BREAKDOWN
-=============
-"""
-    
-    api_counts = articles_df['source_api'].value_counts()
-    for api, count in api_counts.items():
-        report += f"{api.upper()}: {count} articles\n"
-    
-    report += f"""
-
-RELATIONSHIP ANALYSIS
-====================
-Total Relationships Found: {len(relationships)}
-"""
-    
-    if relationships:
-        # Relationship type breakdown
-        type_counts = {}
-        for rel in relationships:
-            rel_type = rel['type']
-            type_counts[rel_type] = type_counts.get(rel_type, 0) + 1
-        
-        report += "Relationship Types:\n"
-        for rel_type, count in type_counts.items():
-            report += f"- {rel_type}: {count}\n"
-        
-        # Strength analysis
-        strengths = [r['strength'] for r in relationships]
-        report += f"""
-Strength Analysis:
-- Average Strength: {sum(strengths)/len(strengths):.3f}
-- Maximum Strength: {max(strengths):.3f}
-- Strong Connections (>0.7): {sum(1 for s in strengths if s > 0.7)}
-"""
-    
-    report += f"""
-
-TOP NEWS SOURCES
-================
-"""
-    
-    source_counts = articles_df['source_name'].value_counts().head(10)
-    for source, count in source_counts.items():
-        report += f"{source}: {count} articles\n"
-    
-    report += f"""
-
-METHODOLOGY
-===========
-- Data Collection: Real-time API integration
-- APIs Used: NewsAPI.org, Guardian API, NewsData.io
-- Analysis Methods: Keyword overlap, temporal proximity, source cross-reference
-- Relationship Detection: Multi-factor analysis
-- Deduplication: Title similarity filtering
-
-TECHNICAL DETAILS
-==================
-- Collection Time: Real-time during analysis
-- Processing: Live analysis pipeline
-- Export Format: CSV and text reports
-- Network Analysis: Graph-based relationship mapping
-
-This report contains analysis of news data collected during the demonstration.
-Generated by NewsGraph Analysis System.
-"""
-    
-    return report
+def offer_download(label, path, mime):
+    """Serve an exported file from disk"""
+    st.success(f"Saved {path.name} ({path.stat().st_size / 1024:,.1f} KB)")
+    with open(path, "rb") as handle:
+        st.download_button(label=label, data=handle, file_name=path.name, mime=mime)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,112 @@
+"""
+Similarity benchmark: raw TF-IDF cosine vs LSA
+Compares top-k neighbour search on sparse TF-IDF with the LSA mode on a
+synthetic corpus of paraphrased stories (or on an imported corpus) and
+reports timings, neighbour recall and same-story precision.
+
+    python benchmarks/similarity_benchmark.py --articles 20000 --components 200
+    python benchmarks/similarity_benchmark.py --corpus data/raw/articles.jsonl
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.analysis.relationships import build_tfidf
+from src.analysis.semantic import lsa_vectors
+from src.analysis.similarity import top_k_similar
+
+# Each concept can be written several ways (synonyms), so articles about the
+# same story rarely share all of their words
+N_CONCEPTS = 400
+SYNONYMS = 4
+N_ENTITIES = 300
+FILLER = ["report", "said", "week", "sources", "according", "statement", "today", "news", "update", "plan"]
+
+
+def synthetic_corpus(n_articles, story_size=10, seed=0):
+    """Articles grouped into stories whose members paraphrase each other"""
+    rng = np.random.default_rng(seed)
+    articles, stories = [], []
+    story = 0
+    while len(articles) < n_articles:
+        entities = rng.choice(N_ENTITIES, size=2, replace=False)
+        concepts = rng.choice(N_CONCEPTS, size=4, replace=False)
+        for _ in range(story_size):
+            words = [f"entity{e}" for e in entities]
+            # Each article mentions three of the story's four concepts, in its own wording
+            words += [f"concept{c}x{rng.integers(SYNONYMS)}" for c in rng.choice(concepts, size=3, replace=False)]
+            words += list(rng.choice(FILLER, size=4))
+            rng.shuffle(words)
+            articles.append({"title": " ".join(words[:5]), "description": " ".join(words[5:]), "content": ""})
+            stories.append(story)
+        story += 1
+    return articles[:n_articles], np.asarray(stories[:n_articles])
+
+
+def load_articles(path, limit):
+    from src.data_collection.importer import load_corpus
+    df, _ = load_corpus(path, limit=limit)
+    return df.fillna("").to_dict("records"), None
+
+
+def neighbour_recall(reference, candidate):
+    """Share of reference neighbours that the candidate search also returns"""
+    hits = total = 0
+    for ref_row, cand_row in zip(reference, candidate):
+        ref = set(ref_row[ref_row >= 0].tolist())
+        hits += len(ref & set(cand_row[cand_row >= 0].tolist()))
+        total += len(ref)
+    return hits / total if total else 0.0
+
+
+def story_precision(indices, stories):
+    """Share of returned neighbours that belong to the same story"""
+    valid = indices >= 0
+    same = (stories[np.where(valid, indices, 0)] == stories[:, None]) & valid
+    return same.sum() / valid.sum() if valid.any() else 0.0
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--articles", type=int, default=10000, help="synthetic corpus size")
+    parser.add_argument("--corpus", help="JSONL/CSV/Parquet corpus to use instead of synthetic data")
+    parser.add_argument("--components", type=int, default=200, help="LSA dimensions (100-300)")
+    parser.add_argument("-k", type=int, default=10, help="neighbours per article")
+    args = parser.parse_args()
+
+    if args.corpus:
+        articles, stories = load_articles(args.corpus, args.articles)
+    else:
+        articles, stories = synthetic_corpus(args.articles)
+    print(f"{len(articles):,} articles, k={args.k}, {args.components} LSA dimensions")
+
+    tfidf, tfidf_time = timed(build_tfidf, articles)
+    (exact, _), exact_time = timed(top_k_similar, tfidf, k=args.k)
+    vectors, svd_time = timed(lsa_vectors, tfidf, n_components=args.components)
+    (approx, _), lsa_time = timed(top_k_similar, vectors, k=args.k)
+
+    print(f"{'':24}{'seconds':>10}")
+    print(f"{'TF-IDF vectorize':24}{tfidf_time:>10.2f}")
+    print(f"{'TF-IDF top-k':24}{exact_time:>10.2f}")
+    print(f"{'LSA fit (SVD)':24}{svd_time:>10.2f}")
+    print(f"{'LSA top-k':24}{lsa_time:>10.2f}")
+    print(f"LSA recall of TF-IDF neighbours: {neighbour_recall(exact, approx):.3f}")
+    if stories is not None:
+        print(f"Same-story precision, TF-IDF:   {story_precision(exact, stories):.3f}")
+        print(f"Same-story precision, LSA:      {story_precision(approx, stories):.3f}")
+
+
+if __name__ == "__main__":
+    main()
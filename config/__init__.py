@@ -0,0 +1,3 @@
+"""
+NewsGraph configuration
+"""
@@ -0,0 +1,45 @@
+"""
+News Provider Configuration
+Each entry instantiates an adapter from src/data_collection/providers.py.
+The key is the adapter name unless an explicit "adapter" is given, which
+allows several sources of the same kind (e.g. two RSS bundles).
+"""
+from config.api_keys import API_KEYS
+
+PROVIDERS = {
+    # NewsAPI.org - 1,000 requests/day
+    "newsapi": {
+        "enabled": True,
+        "api_key": API_KEYS["newsapi"],
+        "max_pages": 2
+    },
+
+    # The Guardian API - 12,000 requests/day
+    "guardian": {
+        "enabled": True,
+        "api_key": API_KEYS["guardian"],
+        "max_pages": 3
+    },
+
+    # NewsData.io - 200 requests/day, keep pagination minimal
+    "newsdata": {
+        "enabled": True,
+        "api_key": API_KEYS["newsdata"],
+        "max_pages": 1
+    },
+
+    # RSS feeds - no key or quota, filtered locally by the search query
+    "rss": {
+        "enabled": False,
+        "feeds": [
+            "https://feeds.bbci.co.uk/news/world/rss.xml",
+            "https://www.aljazeera.com/xml/rss/all.xml"
+        ]
+    },
+
+    # Local JSONL dump in the article schema (e.g. a previous export)
+    "jsonl": {
+        "enabled": False,
+        "path": "data/raw/articles.jsonl"
+    }
+}
@@ -0,0 +1,3 @@
+"""
+NewsGraph core modules
+"""
@@ -0,0 +1,3 @@
+"""
+Relationship analysis and corpus statistics
+"""
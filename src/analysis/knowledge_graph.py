@@ -0,0 +1,269 @@
+"""
+Entity-centric knowledge graph
+Articles, entities and news sources are stored as integer nodes in a
+compressed sparse row (CSR) adjacency structure. Neighbourhood and path
+queries expand whole BFS frontiers with vectorized numpy gathers, so they
+stay fast on graphs with millions of edges.
+"""
+import re
+from bisect import bisect_left
+from collections import defaultdict
+
+import numpy as np
+
+NODE_KINDS = ("article", "entity", "source")
+EDGE_TYPES = ("related", "mentions", "published_by")
+
+ARTICLE, ENTITY, SOURCE = range(len(NODE_KINDS))
+RELATED, MENTIONS, PUBLISHED_BY = range(len(EDGE_TYPES))
+
+_word = re.compile(r"\w+")
+
+
+class KnowledgeGraph:
+    """Undirected multi-kind graph in CSR form"""
+
+    def __init__(self):
+        self.node_index = {}
+        self.labels = []
+        self._kinds = []
+        self._sources = []
+        self._targets = []
+        self._weights = []
+        self._types = []
+        self.indptr = None
+
+    # Construction
+
+    def add_node(self, key, kind, label):
+        """Register a node, returning its integer id"""
+        node_id = self.node_index.get(key)
+        if node_id is None:
+            node_id = len(self.labels)
+            self.node_index[key] = node_id
+            self.labels.append(label)
+            self._kinds.append(kind)
+        return node_id
+
+    def add_edge(self, a, b, edge_type, weight=1.0):
+        self._sources.append(a)
+        self._targets.append(b)
+        self._weights.append(weight)
+        self._types.append(edge_type)
+
+    def build(self):
+        """Freeze the edge list into CSR arrays (each edge stored in both directions)"""
+        n = len(self.labels)
+        sources = np.asarray(self._sources, dtype=np.int64)
+        targets = np.asarray(self._targets, dtype=np.int64)
+        rows = np.concatenate([sources, targets])
+        cols = np.concatenate([targets, sources])
+        weights = np.tile(np.asarray(self._weights, dtype=np.float32), 2)
+        types = np.tile(np.asarray(self._types, dtype=np.int8), 2)
+
+        order = np.argsort(rows, kind="stable")
+        self.indices = cols[order].astype(np.int32)
+        self.weights = weights[order]
+        self.edge_types = types[order]
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=self.indptr[1:])
+        self.kinds = np.asarray(self._kinds, dtype=np.int8)
+
+        self._sources, self._targets, self._weights, self._types = [], [], [], []
+        self._build_label_index()
+        return self
+
+    def _build_label_index(self):
+        """Exact-label and word -> nodes lookups for find()"""
+        self._lowercase_labels = [label.lower() for label in self.labels]
+        by_label = defaultdict(list)
+        by_word = defaultdict(list)
+        for node, label in enumerate(self._lowercase_labels):
+            by_label[label.strip()].append(node)
+            for word in set(_word.findall(label)):
+                by_word[word].append(node)
+        self._label_index = dict(by_label)
+        self._word_index = dict(by_word)
+        self._vocabulary = sorted(by_word)
+
+    @classmethod
+    def from_corpus(cls, articles_df, relationships, entity_index=None):
+        """Graph of articles, their sources, their entities and their relationships"""
+        graph = cls()
+        titles = articles_df["title"].astype(str).tolist()
+        sources = articles_df["source_name"].astype(str).tolist()
+
+        for article_id, (title, source) in enumerate(zip(titles, sources)):
+            node = graph.add_node(("article", article_id), ARTICLE, title)
+            source_node = graph.add_node(("source", source), SOURCE, source)
+            graph.add_edge(node, source_node, PUBLISHED_BY)
+
+        if entity_index is not None:
+            for key, article_ids in entity_index.postings.items():
+                entity_node = graph.add_node(("entity", key), ENTITY, entity_index.display_name(key))
+                for article_id in article_ids:
+                    graph.add_edge(graph.node_index[("article", article_id)], entity_node, MENTIONS)
+
+        for rel in relationships:
+            graph.add_edge(
+                graph.node_index[("article", rel["article1_id"])],
+                graph.node_index[("article", rel["article2_id"])],
+                RELATED,
+                rel["strength"],
+            )
+
+        return graph.build()
+
+    # Lookups
+
+    @property
+    def num_nodes(self):
+        return len(self.labels)
+
+    @property
+    def num_edges(self):
+        return len(self.indices) // 2
+
+    def article_node(self, article_id):
+        return self.node_index[("article", article_id)]
+
+    def kind(self, node):
+        return NODE_KINDS[self.kinds[node]]
+
+    def _prefix_nodes(self, prefix):
+        """Nodes with a label word starting with `prefix`"""
+        nodes = set()
+        position = bisect_left(self._vocabulary, prefix)
+        while position < len(self._vocabulary) and self._vocabulary[position].startswith(prefix):
+            nodes.update(self._word_index[self._vocabulary[position]])
+            position += 1
+        return nodes
+
+    def find(self, text, kind=None, limit=20):
+        """Nodes whose label contains `text` from a word boundary (case-insensitive), exact matches first"""
+        text = text.lower().strip()
+        words = _word.findall(text)
+        if not words:
+            return []
+        kind_code = NODE_KINDS.index(kind) if kind else None
+        exact = self._label_index.get(text, [])
+
+        # Every complete query word must appear in the label, the last may be a prefix
+        candidates = self._prefix_nodes(words[-1])
+        for word in words[:-1]:
+            candidates.intersection_update(self._word_index.get(word, ()))
+        exact_set = set(exact)
+        partial = sorted(
+            node for node in candidates
+            if node not in exact_set and text in self._lowercase_labels[node]
+        )
+        matches = exact + partial
+        if kind_code is not None:
+            matches = [node for node in matches if self.kinds[node] == kind_code]
+        return matches[:limit]
+
+    def neighbors(self, node):
+        """Adjacent node ids"""
+        return self.indices[self.indptr[node]:self.indptr[node + 1]]
+
+    def _expand(self, frontier):
+        """All (neighbor, parent) pairs of a frontier, gathered without a Python loop"""
+        starts = self.indptr[frontier]
+        lengths = self.indptr[frontier + 1] - starts
+        total = int(lengths.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        positions = offsets + np.arange(total)
+        return self.indices[positions].astype(np.int64), np.repeat(frontier, lengths)
+
+    # Queries
+
+    def neighborhood(self, node, k=1, kinds=None, max_nodes=None):
+        """Nodes within k hops of `node`, as {node_id: hop distance}"""
+        distance = np.full(self.num_nodes, -1, dtype=np.int32)
+        distance[node] = 0
+        frontier = np.array([node], dtype=np.int64)
+        for hop in range(1, k + 1):
+            found, _ = self._expand(frontier)
+            found = np.unique(found)
+            frontier = found[distance[found] < 0]
+            if frontier.size == 0:
+                break
+            distance[frontier] = hop
+            if max_nodes is not None and np.count_nonzero(distance >= 0) > max_nodes:
+                break
+
+        reached = np.flatnonzero(distance > 0)
+        if kinds:
+            codes = [NODE_KINDS.index(kind) for kind in kinds]
+            reached = reached[np.isin(self.kinds[reached], codes)]
+        reached = reached[np.argsort(distance[reached], kind="stable")]
+        if max_nodes is not None:
+            reached = reached[:max_nodes]
+        return {int(n): int(distance[n]) for n in reached}
+
+    def shortest_path(self, source, target, max_depth=None):
+        """Node ids on a shortest path between two nodes (bidirectional BFS), or None
+
+        Without `max_depth` None means the nodes are not connected; with it,
+        None may also mean that no path within `max_depth` expansions exists.
+        """
+        if source == target:
+            return [source]
+        parents = [np.full(self.num_nodes, -1, dtype=np.int64) for _ in range(2)]
+        parents[0][source] = source
+        parents[1][target] = target
+        frontiers = [np.array([source], dtype=np.int64), np.array([target], dtype=np.int64)]
+
+        depth = 0
+        while max_depth is None or depth < max_depth:
+            depth += 1
+            # Expand the smaller side first
+            side = 0 if frontiers[0].size <= frontiers[1].size else 1
+            found, via = self._expand(frontiers[side])
+            fresh = parents[side][found] < 0
+            found, via = found[fresh], via[fresh]
+            found, first = np.unique(found, return_index=True)
+            via = via[first]
+            if found.size == 0:
+                return None
+            parents[side][found] = via
+
+            meeting = found[parents[1 - side][found] >= 0]
+            if meeting.size:
+                return self._join_path(parents, int(meeting[0]))
+            frontiers[side] = found
+        return None
+
+    @staticmethod
+    def _join_path(parents, middle):
+        forward = [middle]
+        while parents[0][forward[-1]] != forward[-1]:
+            forward.append(int(parents[0][forward[-1]]))
+        backward = [middle]
+        while parents[1][backward[-1]] != backward[-1]:
+            backward.append(int(parents[1][backward[-1]]))
+        return forward[::-1] + backward[1:]
+
+    def edge_between(self, a, b):
+        """(edge type, weight) of the strongest edge between two adjacent nodes"""
+        start, end = self.indptr[a], self.indptr[a + 1]
+        matches = np.flatnonzero(self.indices[start:end] == b)
+        if matches.size == 0:
+            return None
+        best = start + matches[np.argmax(self.weights[start + matches])]
+        return EDGE_TYPES[self.edge_types[best]], float(self.weights[best])
+
+    def connection(self, source, target, max_depth=None):
+        """How two nodes are connected: list of steps with labels and edge types"""
+        path = self.shortest_path(source, target, max_depth=max_depth)
+        if path is None:
+            return None
+        steps = []
+        for position, node in enumerate(path):
+            step = {"node": node, "kind": self.kind(node), "label": self.labels[node]}
+            if position > 0:
+                step["edge_type"], step["weight"] = self.edge_between(path[position - 1], node)
+            steps.append(step)
+        return steps
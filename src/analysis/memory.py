@@ -0,0 +1,123 @@
+"""
+Memory-budgeted analysis
+Chooses similarity block sizes from a RAM ceiling and measures the peak
+resident set size (RSS) of a run. psutil is used when installed, otherwise
+/proc and the resource module.
+
+The ceiling bounds the transient similarity blocks, which dominate the
+cost of a large analysis; the O(n * k) neighbour lists and relationship
+records it produces are held in memory as usual.
+"""
+import os
+import sys
+import threading
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+MIN_BLOCK_ROWS = 16
+MAX_BLOCK_ROWS = 4096
+
+# Share of the remaining budget one similarity block may use; the rest is
+# headroom for vectors, relationship records and allocator slack
+BLOCK_SHARE = 0.25
+
+# spaCy batch size under a budget (NER then also runs in a single process)
+BOUNDED_NER_BATCH = 16
+
+
+def current_rss():
+    """Resident set size of this process in bytes (0 when unknown)"""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+def process_peak_rss():
+    """Highest RSS this process has reached since it started, in bytes"""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kilobytes, macOS bytes
+        return peak if sys.platform == "darwin" else peak * 1024
+    if psutil is not None:
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss)
+    return current_rss()
+
+
+def format_bytes(count):
+    for unit in ("B", "KB", "MB", "GB"):
+        if count < 1024:
+            return f"{count:.0f} {unit}"
+        count /= 1024
+    return f"{count:.1f} TB"
+
+
+class RSSMonitor:
+    """Samples RSS on a background thread to find the peak of one run
+
+    Use as a context manager; `peak` holds the result afterwards.
+    """
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, current_rss())
+
+    def __enter__(self):
+        self.peak = current_rss()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss())
+        if self.peak == 0:
+            self.peak = process_peak_rss()
+        return False
+
+
+class MemoryBudget:
+    """RAM ceiling for one analysis, in bytes"""
+
+    def __init__(self, limit):
+        self.limit = int(limit)
+
+    def available(self):
+        """Bytes left under the ceiling right now"""
+        return max(0, self.limit - current_rss())
+
+    def block_rows(self, n_cols, k=0):
+        """Rows per similarity block so one block fits its share of the budget
+
+        A row costs a float32 similarity row plus the int64 argpartition
+        output of the same width.
+        """
+        return self.rows_for(n_cols * (4 + 8) + k * 16)
+
+    def rows_for(self, row_bytes):
+        """Rows of `row_bytes` each that fit one block's share of the budget"""
+        rows = int(self.available() * BLOCK_SHARE) // max(int(row_bytes), 1)
+        return max(MIN_BLOCK_ROWS, min(MAX_BLOCK_ROWS, rows))
+
+    def ner_options(self):
+        """EntityExtractor.extract settings that avoid forked spaCy workers and large batches"""
+        return {"n_process": 1, "batch_size": BOUNDED_NER_BATCH}
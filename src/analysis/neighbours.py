@@ -0,0 +1,199 @@
+"""
+Incremental top-k neighbour lists
+Each article's neighbour list is cached under its content hash together
+with the set of articles ("corpus") it was computed against. On the next
+run only articles that are new, or whose earlier corpus lost members, are
+searched against the whole corpus; the others are only compared with the
+articles added since, and merged with their cached list.
+Rows that share a content hash are searched once and share one list.
+"""
+import threading
+from collections import defaultdict
+
+import numpy as np
+
+from src.analysis.similarity import DEFAULT_BLOCK_ROWS, top_k_similar
+from src.data_collection.fingerprint import StageCache, corpus_digest
+
+# Above this share of new articles a full search is cheaper than merging
+MAX_GROWTH_SHARE = 0.5
+
+# Cached neighbour pairs rescored at once when there is no memory budget
+PAIR_BLOCK = 16384
+
+_lists = {}
+_lists_lock = threading.Lock()
+_corpora = StageCache("corpora", persistent=False, max_entries=16)
+
+
+def _list_cache(space, k, min_score):
+    key = (space, k, min_score)
+    with _lists_lock:
+        if key not in _lists:
+            _lists[key] = StageCache("neighbours", namespace=f"{space}:k{k}:min{min_score}", persistent=False)
+        return _lists[key]
+
+
+def _search(a, b, k, min_score, budget, exclude=None):
+    """top_k_similar of rows of `a` against `b`, honouring a MemoryBudget
+
+    `exclude` holds, for each row of `a`, its own column in `b` (dropped).
+    """
+    extra = 0 if exclude is None else 1
+    block_rows = budget.block_rows(b.shape[0], k + extra) if budget is not None else DEFAULT_BLOCK_ROWS
+    indices, scores = top_k_similar(a, b, k=k + extra, block_rows=block_rows, min_score=min_score)
+
+    if exclude is not None:
+        indices[indices == np.asarray(exclude)[:, None]] = -1
+    return _best(indices, scores, k)
+
+
+def _best(indices, scores, k):
+    """Keep the k highest-scoring valid slots of each row"""
+    scores = np.where(indices >= 0, scores, -np.inf)
+    order = np.argsort(-scores, axis=1, kind="stable")[:, :k]
+    indices = np.take_along_axis(indices, order, axis=1)
+    scores = np.take_along_axis(scores, order, axis=1)
+    valid = np.isfinite(scores)
+    return np.where(valid, indices, -1).astype(np.int32), np.where(valid, scores, 0.0).astype(np.float32)
+
+
+def _pair_block(vectors, budget):
+    """Pairs rescored at once: each gathers two vector rows and their product"""
+    if budget is None:
+        return PAIR_BLOCK
+    width = vectors.nnz / max(vectors.shape[0], 1) if hasattr(vectors, "nnz") else vectors.shape[1]
+    # float32 value plus int32 column per stored entry
+    return budget.rows_for(3 * max(width, 1) * 8)
+
+
+def _pair_scores(vectors, rows, cols, block):
+    """Cosine of row pairs (0 where the column is -1), `block` pairs at a time"""
+    result = np.zeros(len(rows), dtype=np.float32)
+    pairs = np.flatnonzero(cols >= 0)
+    for start in range(0, len(pairs), block):
+        chunk = pairs[start:start + block]
+        first, second = vectors[rows[chunk]], vectors[cols[chunk]]
+        products = first.multiply(second) if hasattr(first, "multiply") else first * second
+        result[chunk] = np.asarray(products.sum(axis=1)).ravel()
+    return result
+
+
+def cached_top_k(hashes, vectorize, k, space, min_score=0.0, incremental=False, budget=None):
+    """Top-k (indices, scores) per article, reusing cached neighbour lists
+
+    `vectorize()` is only called when some list has to be (re)computed.
+    By default lists are only reused for the identical corpus, so results
+    match a fresh search exactly. With `incremental`, lists from an earlier,
+    smaller corpus are rescored and merged with the added articles instead:
+    much cheaper on a growing corpus, but approximate, since neighbours
+    among the older articles are not searched again under the new IDF
+    (a few percent of lists can differ from a fresh search). Never use it
+    for vector spaces fitted to the whole corpus (e.g. LSA).
+    Duplicate rows (same hash) get the list of the first of them, pointing
+    at first occurrences only, so cold and warm runs agree.
+    """
+    first_rows = {}
+    for row, digest in enumerate(hashes):
+        first_rows.setdefault(digest, row)
+    if len(first_rows) == len(hashes):
+        return _unique_top_k(hashes, vectorize, k, space, min_score, incremental, budget)
+
+    representatives = np.fromiter(first_rows.values(), dtype=np.int64, count=len(first_rows))
+    unique_hashes = list(first_rows)
+    unique_indices, unique_scores = _unique_top_k(
+        unique_hashes, lambda: vectorize()[representatives], k, space, min_score, incremental, budget
+    )
+    slot = {digest: position for position, digest in enumerate(unique_hashes)}
+    rows = np.fromiter((slot[digest] for digest in hashes), dtype=np.int64, count=len(hashes))
+    mapped = np.where(unique_indices >= 0, representatives[np.maximum(unique_indices, 0)], -1)
+
+    width = max(0, min(k, len(hashes) - 1))
+    indices = np.full((len(hashes), width), -1, dtype=np.int32)
+    scores = np.zeros((len(hashes), width), dtype=np.float32)
+    indices[:, :mapped.shape[1]] = mapped[rows]
+    scores[:, :mapped.shape[1]] = unique_scores[rows]
+    return indices, scores
+
+
+def _unique_top_k(hashes, vectorize, k, space, min_score, incremental, budget):
+    """cached_top_k for a list of distinct hashes"""
+    n = len(hashes)
+    k = max(0, min(k, n - 1))
+    lists = _list_cache(space, k, min_score)
+    current = corpus_digest(hashes)
+    members = sorted(set(hashes))
+    position = {digest: row for row, digest in enumerate(hashes)}
+
+    indices = np.full((n, k), -1, dtype=np.int32)
+    scores = np.zeros((n, k), dtype=np.float32)
+    if k == 0:
+        return indices, scores
+
+    entries = lists.get_many(set(hashes))
+    groups = defaultdict(list)
+    for row, digest in enumerate(hashes):
+        entry = entries[digest]
+        groups[entry[0] if entry is not None else None].append(row)
+
+    vectors = None
+    reused = set()
+    full_rows = list(groups.pop(None, []))
+    known = _corpora.get_many(list(groups))
+    for corpus, rows in groups.items():
+        earlier = known[corpus]
+        if earlier is None or not set(earlier) <= position.keys():
+            full_rows.extend(rows)
+            continue
+        if corpus != current and (not incremental or n - len(earlier) > n * MAX_GROWTH_SHARE):
+            full_rows.extend(rows)
+            continue
+
+        # Cached lists, mapped from the earlier corpus onto current rows
+        cached_idx = np.full((len(rows), k), -1, dtype=np.int32)
+        cached_scores = np.zeros((len(rows), k), dtype=np.float32)
+        for slot, row in enumerate(rows):
+            _, neighbour_positions, neighbour_scores = entries[hashes[row]]
+            width = min(k, len(neighbour_positions))
+            cached_idx[slot, :width] = [position[earlier[p]] for p in neighbour_positions[:width]]
+            cached_scores[slot, :width] = neighbour_scores[:width]
+
+        if corpus == current:
+            indices[rows], scores[rows] = cached_idx, cached_scores
+            reused.update(rows)
+            continue
+
+        # Rescore the cached neighbours (corpus statistics have changed), then
+        # compare only with the articles added since the earlier corpus
+        vectors = vectors if vectors is not None else vectorize()
+        cached_scores = _pair_scores(
+            vectors, np.repeat(rows, k), cached_idx.ravel(), _pair_block(vectors, budget)
+        ).reshape(len(rows), k)
+        cached_idx = np.where(cached_scores > min_score, cached_idx, -1)
+        earlier_set = set(earlier)
+        added = np.array([row for row, digest in enumerate(hashes) if digest not in earlier_set], dtype=np.int64)
+        new_idx, new_scores = _search(vectors[rows], vectors[added], k, min_score, budget)
+        new_idx = np.where(new_idx >= 0, added[np.maximum(new_idx, 0)], -1)
+        indices[rows], scores[rows] = _best(
+            np.hstack([cached_idx, new_idx]), np.hstack([cached_scores, new_scores]), k
+        )
+
+    if full_rows:
+        vectors = vectors if vectors is not None else vectorize()
+        full_rows = np.array(sorted(full_rows), dtype=np.int64)
+        indices[full_rows], scores[full_rows] = _search(
+            vectors[full_rows], vectors, k, min_score, budget, exclude=full_rows
+        )
+
+    # Store every recomputed or merged list against the current corpus
+    _corpora.set(current, members)
+    rank = {digest: p for p, digest in enumerate(members)}
+    updates = {}
+    for row, digest in enumerate(hashes):
+        if row in reused:
+            continue
+        valid = indices[row] >= 0
+        positions = np.array([rank[hashes[j]] for j in indices[row][valid]], dtype=np.int32)
+        updates[digest] = (current, positions, scores[row][valid].copy())
+    lists.set_many(updates)
+    return indices, scores
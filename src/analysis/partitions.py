@@ -0,0 +1,270 @@
+"""
+Time-partitioned similarity index for long-horizon analysis
+The corpus is split into weekly shards. Each shard holds L2-normalized
+TF-IDF vectors in a shared hashed feature space plus its intra-shard top-k
+neighbours; adjacent shards are linked by cross-partition top-k. Shards of
+past weeks are immutable and cached on disk under a content-addressed name,
+so a query over a date range only loads and computes the shards it touches.
+
+IDF weights are fitted per shard, which is what keeps past shards immutable:
+a term's weight reflects its rarity in that week, so scores of pairs from
+different weeks (and cross-week links) are only roughly comparable.
+Articles without a parseable date are not assigned to any shard; their
+count is reported by summary().
+"""
+import hashlib
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from src.analysis.similarity import DEFAULT_BLOCK_ROWS, neighbour_pairs, top_k_similar
+from src.analysis.vectors import N_FEATURES, tfidf_vectors, vectorize
+from src.data_collection.fingerprint import content_hash
+
+DEFAULT_SHARD_DIR = Path(__file__).resolve().parents[2] / "data" / "processed" / "shards"
+DEFAULT_TOP_K = 10
+
+# Bumped when the cached cross-week link format or its contents change;
+# version 1 files dropped links between equal local row numbers
+LINK_CACHE_VERSION = 2
+
+
+def partition_key(timestamp):
+    """ISO week label such as 2024-W05"""
+    year, week, _ = timestamp.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def range_bounds(start=None, end=None):
+    """UTC [start, end) timestamps of a date range; a date-only end covers that whole day"""
+    start = pd.Timestamp(start, tz="UTC") if start is not None else None
+    if end is not None:
+        end = pd.Timestamp(end, tz="UTC")
+        if end == end.normalize():
+            end += pd.Timedelta(days=1)
+    return start, end
+
+
+def week_bounds(key):
+    """UTC start and end timestamps of an ISO week label"""
+    year, week = key.split("-W")
+    start = datetime.fromisocalendar(int(year), int(week), 1).replace(tzinfo=timezone.utc)
+    return pd.Timestamp(start), pd.Timestamp(start) + pd.Timedelta(days=7)
+
+
+class Shard:
+    """Vectors and neighbour lists of one week of articles"""
+
+    def __init__(self, key, hashes, matrix, neighbours, neighbour_scores):
+        self.key = key
+        self.hashes = hashes
+        self.matrix = matrix
+        self.neighbours = neighbours
+        self.neighbour_scores = neighbour_scores
+
+    @property
+    def digest(self):
+        return shard_digest(self.key, self.hashes)
+
+    @property
+    def closed(self):
+        """True once the week is over; closed shards never change"""
+        return week_bounds(self.key)[1] <= pd.Timestamp.now(tz="UTC")
+
+    def save(self, path):
+        np.savez_compressed(
+            path,
+            key=self.key,
+            hashes=np.asarray(self.hashes),
+            data=self.matrix.data,
+            indices=self.matrix.indices,
+            indptr=self.matrix.indptr,
+            neighbours=self.neighbours,
+            neighbour_scores=self.neighbour_scores,
+        )
+
+    @classmethod
+    def load(cls, path):
+        stored = np.load(path)
+        hashes = stored["hashes"].tolist()
+        matrix = sp.csr_matrix(
+            (stored["data"], stored["indices"], stored["indptr"]),
+            shape=(len(hashes), N_FEATURES),
+        )
+        return cls(str(stored["key"]), hashes, matrix, stored["neighbours"], stored["neighbour_scores"])
+
+
+def shard_digest(key, hashes):
+    """Content address of a shard: its week plus the hashes of its articles"""
+    digest = hashlib.blake2b(digest_size=12)
+    digest.update(key.encode("utf-8"))
+    for value in sorted(hashes):
+        digest.update(value.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class TimePartitionedIndex:
+    """Weekly shards over a corpus with intra- and cross-partition top-k links"""
+
+    def __init__(self, articles_df, top_k=DEFAULT_TOP_K, cache_dir=DEFAULT_SHARD_DIR, budget=None):
+        self.top_k = top_k
+        self.cache_dir = Path(cache_dir)
+        self.budget = budget
+        self.shards = {}
+
+        published = pd.to_datetime(articles_df["published_at"], errors="coerce", utc=True, format="mixed")
+        self.published = published.to_numpy()
+        self.undated = np.flatnonzero(published.isna().to_numpy())
+        dated = published.dropna()
+
+        self.partitions = {}
+        for position, timestamp in zip(np.flatnonzero(published.notna().to_numpy()), dated):
+            self.partitions.setdefault(partition_key(timestamp), []).append(int(position))
+        self.keys = sorted(self.partitions)
+        self._articles_df = articles_df
+
+    def _block_rows(self, n_cols, k):
+        return self.budget.block_rows(n_cols, k) if self.budget is not None else DEFAULT_BLOCK_ROWS
+
+    def _records(self, rows):
+        return self._articles_df.iloc[rows].to_dict("records")
+
+    def shard(self, key):
+        """Load or build the shard for one week"""
+        if key in self.shards:
+            return self.shards[key]
+
+        # Order rows by content hash so a cached shard lines up with the corpus
+        # regardless of the order articles were collected in
+        rows = self.partitions[key]
+        records = self._records(rows)
+        hashes = [content_hash(record) for record in records]
+        order = np.argsort(hashes, kind="stable")
+        rows = [rows[i] for i in order]
+        records = [records[i] for i in order]
+        hashes = [hashes[i] for i in order]
+
+        path = self.cache_dir / f"{key}_k{self.top_k}_{shard_digest(key, hashes)}.npz"
+        if path.exists():
+            shard = Shard.load(path)
+        else:
+            matrix = tfidf_vectors(records)
+            neighbours, neighbour_scores = top_k_similar(
+                matrix, k=self.top_k, block_rows=self._block_rows(matrix.shape[0], self.top_k)
+            )
+            shard = Shard(key, hashes, matrix, neighbours, neighbour_scores)
+            if shard.closed:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                shard.save(path)
+
+        shard.rows = np.asarray(rows, dtype=np.int64)
+        self.shards[key] = shard
+        return shard
+
+    def keys_between(self, start=None, end=None):
+        """Week labels overlapping [start, end]"""
+        start, end = range_bounds(start, end)
+        selected = []
+        for key in self.keys:
+            week_start, week_end = week_bounds(key)
+            if start is not None and week_end <= start:
+                continue
+            if end is not None and week_start >= end:
+                continue
+            selected.append(key)
+        return selected
+
+    def in_range(self, start=None, end=None):
+        """Boolean mask of rows published within [start, end]"""
+        start, end = range_bounds(start, end)
+        mask = ~pd.isna(self.published)
+        if start is not None:
+            mask &= self.published >= start
+        if end is not None:
+            mask &= self.published < end
+        return mask
+
+    def similar_pairs(self, min_score=0.0, start=None, end=None):
+        """{(row_i, row_j): score} from intra-shard and adjacent-shard top-k
+
+        Shards are whole weeks, so pairs are filtered to articles published
+        within the exact range afterwards.
+        """
+        keys = self.keys_between(start, end)
+        pairs = {}
+
+        for position, key in enumerate(keys):
+            shard = self.shard(key)
+            for pair, score in neighbour_pairs(shard.neighbours, shard.neighbour_scores, shard.rows, shard.rows).items():
+                if score >= min_score:
+                    pairs[pair] = max(score, pairs.get(pair, 0.0))
+
+            # Link consecutive weeks only; stories rarely jump across a gap of quiet weeks
+            if position + 1 < len(keys):
+                following = self.shard(keys[position + 1])
+                for pair, score in self._cross_links(shard, following).items():
+                    if score >= min_score:
+                        pairs[pair] = max(score, pairs.get(pair, 0.0))
+
+        if start is not None or end is not None:
+            selected = self.in_range(start, end)
+            pairs = {(i, j): score for (i, j), score in pairs.items() if selected[i] and selected[j]}
+        return pairs
+
+    def _cross_links(self, shard, following):
+        """Top-k links in both directions between two shards, cached when both are closed"""
+        path = self.cache_dir / f"link_v{LINK_CACHE_VERSION}_k{self.top_k}_{shard.digest}_{following.digest}.npz"
+        if path.exists():
+            stored = np.load(path)
+            local = zip(stored["first"], stored["second"], stored["scores"])
+        else:
+            local = []
+            for a, b, forward in ((shard, following, True), (following, shard, False)):
+                indices, scores = top_k_similar(
+                    a.matrix, b.matrix, k=self.top_k, block_rows=self._block_rows(b.matrix.shape[0], self.top_k)
+                )
+                # Local row numbers of two different shards: equal numbers are not self matches
+                rows, slots = np.nonzero(indices >= 0)
+                for i, j, score in zip(rows.tolist(), indices[rows, slots].tolist(), scores[rows, slots].tolist()):
+                    local.append((i, j, score) if forward else (j, i, score))
+            if shard.closed and following.closed:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                first, second, scores = zip(*local) if local else ((), (), ())
+                np.savez_compressed(path, first=np.asarray(first, dtype=np.int32),
+                                    second=np.asarray(second, dtype=np.int32),
+                                    scores=np.asarray(scores, dtype=np.float32))
+
+        links = {}
+        for i, j, score in local:
+            a, b = int(shard.rows[i]), int(following.rows[j])
+            key = (min(a, b), max(a, b))
+            links[key] = max(float(score), links.get(key, 0.0))
+        return links
+
+    def search(self, text, k=10, start=None, end=None):
+        """Rows most similar to a free-text query within a date range"""
+        query = vectorize([text])
+        selected = self.in_range(start, end)
+        results = []
+        for key in self.keys_between(start, end):
+            shard = self.shard(key)
+            local = np.flatnonzero(selected[shard.rows])
+            if local.size == 0:
+                continue
+            indices, scores = top_k_similar(query, shard.matrix[local], k=k)
+            results.extend(
+                (float(score), int(shard.rows[local[index]]))
+                for index, score in zip(indices[0], scores[0]) if index >= 0
+            )
+        results.sort(reverse=True)
+        return [(row, score) for score, row in results[:k]]
+
+    def summary(self):
+        """Articles per week, plus how many could not be dated"""
+        return {
+            "weeks": {key: len(rows) for key, rows in self.partitions.items()},
+            "undated": int(len(self.undated)),
+        }
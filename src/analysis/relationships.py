@@ -0,0 +1,168 @@
+"""
+Relationship detection between articles
+Combines content similarity (TF-IDF and cosine similarity, or LSA vectors)
+with indexed entity co-occurrence. Each signal proposes at most k candidate
+links per article, which are then sparsified to a bounded edge budget.
+Neighbour lists are cached per article content hash.
+"""
+from src.analysis.memory import MemoryBudget
+from src.analysis.neighbours import cached_top_k
+from src.analysis.partitions import DEFAULT_TOP_K, TimePartitionedIndex
+from src.analysis.semantic import lsa_vectors
+from src.analysis.similarity import neighbour_pairs
+from src.analysis.sparsify import DEFAULT_MAX_DEGREE, sparsify
+from src.analysis.vectors import tfidf_vectors
+from src.data_collection.fingerprint import content_hash
+
+# Candidate links weaker than this are noise, even as backbone "chain" links
+MIN_LINK_SCORE = 0.1
+
+LSA_METHOD = "Semantic Similarity (LSA)"
+
+
+def make_relationship(articles, i, j, rel_type, strength, evidence, method):
+    """Relationship record between articles i and j"""
+    article1 = articles[i]
+    article2 = articles[j]
+    return {
+        "article1_id": i,
+        "article2_id": j,
+        "article1_title": article1['title'],
+        "article2_title": article2['title'],
+        "article1_source": article1['source_name'],
+        "article2_source": article2['source_name'],
+        "article1_date": article1.get('published_at', ''),
+        "article2_date": article2.get('published_at', ''),
+        "type": rel_type,
+        "strength": float(strength),
+        "evidence": evidence,
+        "method": method
+    }
+
+
+def build_tfidf(articles):
+    """TF-IDF matrix of Title + Description + Content
+
+    Vectors live in the shared hashed feature space of `vectors` (cached
+    term counts, sublinear TF) instead of a per-corpus
+    TfidfVectorizer(max_features=5000); all terms are kept, so scores differ
+    slightly from the 5000-term vocabulary used before.
+    """
+    return tfidf_vectors(articles)
+
+
+def similarity_relationships(articles, vectorize, k, evidence_label, method, budget=None, incremental=False):
+    """Relationships from each article's top-k most similar articles
+
+    Neighbour lists are cached per article content hash and reused when the
+    same corpus is analysed again, with results identical to a fresh search.
+    `incremental` also reuses them after the corpus grows, searching only
+    the added articles: faster, but approximate (see neighbours.cached_top_k).
+    With a MemoryBudget the similarity blocks of the search are sized to the
+    RAM ceiling.
+    """
+    hashes = [content_hash(article) for article in articles]
+    indices, scores = cached_top_k(
+        hashes, lambda: vectorize(articles), k, space=method, min_score=MIN_LINK_SCORE,
+        incremental=incremental, budget=budget
+    )
+    pairs = neighbour_pairs(indices, scores)
+
+    relationships = []
+    for (i, j), score in pairs.items():
+        evidence = f"{evidence_label}: {score:.2f}"
+        relationships.append(make_relationship(
+            articles, i, j, "Content Similarity", score, evidence, method
+        ))
+    return relationships
+
+
+def content_similarity_relationships(articles, k=DEFAULT_TOP_K, budget=None, incremental=False):
+    """Relationships from TF-IDF and Cosine Similarity"""
+    return similarity_relationships(
+        articles, build_tfidf, k, "Similarity Score", "TF-IDF & Cosine Similarity", budget, incremental
+    )
+
+
+def lsa_relationships(articles, k=DEFAULT_TOP_K, budget=None):
+    """Relationships from the top-k nearest neighbours in LSA space"""
+    if len(articles) < 2:
+        return []
+    # The SVD basis depends on the whole corpus, so lists are only reused for an identical corpus
+    return similarity_relationships(
+        articles, lambda corpus: lsa_vectors(build_tfidf(corpus)), k, "Semantic Similarity",
+        "LSA (truncated SVD) & top-k cosine", budget, incremental=False
+    )
+
+
+def entity_relationships(articles, entity_index, min_shared=2):
+    """Relationships between articles that mention the same entities"""
+    relationships = []
+    for (i, j), shared in entity_index.cooccurrence_pairs(min_shared=min_shared).items():
+        strength = entity_index.overlap_score(i, j, len(shared))
+        names = ", ".join(sorted(entity_index.display_name(key) for key in shared)[:5])
+        relationships.append(make_relationship(
+            articles, i, j, "Entity Overlap", strength, f"Shared entities: {names}", "spaCy NER co-occurrence"
+        ))
+    return relationships
+
+
+def time_partitioned_relationships(articles, articles_df, start=None, end=None, index=None, budget=None):
+    """Relationships from weekly similarity shards, limited to a date range
+
+    Undated articles are not part of any shard and get no similarity links.
+    """
+    index = index or TimePartitionedIndex(articles_df, budget=budget)
+    relationships = []
+    for (i, j), score in index.similar_pairs(min_score=MIN_LINK_SCORE, start=start, end=end).items():
+        evidence = f"Similarity Score: {score:.2f}"
+        relationships.append(make_relationship(
+            articles, i, j, "Content Similarity", score, evidence, "Weekly TF-IDF shards & top-k linking"
+        ))
+    return relationships
+
+
+def analyze_relationships(articles_df, threshold, methods, entity_index=None, date_range=None,
+                          max_degree=DEFAULT_MAX_DEGREE, backbone=True, disparity_alpha=None,
+                          memory_limit=None):
+    """Analyze relationships in news data
+
+    With `date_range` (start, end) the corpus is handled as weekly shards and
+    only the weeks overlapping the range are compared. Selecting LSA_METHOD
+    replaces raw TF-IDF cosine with top-k search over LSA vectors.
+
+    Similarity links must reach `threshold`; each article then keeps at most
+    `max_degree` links per signal, plus the spanning-forest backbone when
+    `backbone` is set, so the result has O(n * max_degree) edges.
+
+    `memory_limit` (bytes) sizes the similarity blocks of every search path
+    to a RAM ceiling, trading speed for safety.
+    """
+    relationships = []
+    articles = articles_df.to_dict('records')
+    candidates = max(DEFAULT_TOP_K, max_degree)
+    budget = MemoryBudget(memory_limit) if memory_limit else None
+
+    # Text similarity is the default signal; entity overlap can also run on its own
+    if set(methods) != {"Entity Overlap"}:
+        if date_range is not None:
+            start, end = date_range
+            similar = time_partitioned_relationships(articles, articles_df, start, end, budget=budget)
+        elif LSA_METHOD in methods:
+            similar = lsa_relationships(articles, candidates, budget)
+        else:
+            similar = content_similarity_relationships(articles, candidates, budget)
+        relationships.extend(sparsify(
+            similar, len(articles), max_degree, min_strength=threshold, backbone=backbone, alpha=disparity_alpha
+        ))
+
+    if "Entity Overlap" in methods and entity_index is not None:
+        relationships.extend(sparsify(
+            entity_relationships(articles, entity_index), len(articles), max_degree,
+            backbone=backbone, alpha=disparity_alpha
+        ))
+
+    # Sort by strength
+    relationships.sort(key=lambda x: x['strength'], reverse=True)
+
+    return relationships
@@ -0,0 +1,42 @@
+"""
+Latent semantic analysis (LSA) vectors
+Projects a sparse TF-IDF matrix onto a few hundred latent dimensions with
+randomized truncated SVD. Headlines that paraphrase each other end up close
+even without shared words, and similarity search becomes small dense matrix
+products instead of sparse ones over thousands of features.
+"""
+import numpy as np
+from sklearn.decomposition import TruncatedSVD
+from sklearn.preprocessing import normalize
+
+DEFAULT_COMPONENTS = 200
+MIN_COMPONENTS = 100
+MAX_COMPONENTS = 300
+
+
+def component_count(n_samples, n_features, requested=DEFAULT_COMPONENTS):
+    """Latent dimensions to fit, bounded by the matrix rank"""
+    requested = min(max(requested, MIN_COMPONENTS), MAX_COMPONENTS)
+    return max(1, min(requested, n_samples - 1, n_features - 1))
+
+
+def lsa_vectors(tfidf_matrix, n_components=DEFAULT_COMPONENTS, random_state=0):
+    """L2-normalized float32 LSA vectors, one row per document"""
+    # Hashed feature spaces are mostly empty columns; dropping them keeps
+    # the randomized projections small
+    if hasattr(tfidf_matrix, "getnnz"):
+        tfidf_matrix = tfidf_matrix.tocsc()[:, tfidf_matrix.getnnz(axis=0) > 0].tocsr()
+
+    n_samples, n_features = tfidf_matrix.shape
+    if n_samples < 3 or n_features < 3:
+        # Too small to factorize; fall back to the TF-IDF rows themselves
+        return normalize(tfidf_matrix.toarray()).astype(np.float32)
+
+    svd = TruncatedSVD(
+        n_components=component_count(n_samples, n_features, n_components),
+        algorithm="randomized",
+        n_iter=5,
+        random_state=random_state,
+    )
+    vectors = svd.fit_transform(tfidf_matrix.astype(np.float32))
+    return normalize(vectors).astype(np.float32)
@@ -0,0 +1,71 @@
+"""
+Blocked top-k cosine similarity
+Rows of the query matrix are processed in blocks so only a block x n slice
+of the similarity matrix exists at any time, instead of the full n x n.
+Inputs are expected to be L2-normalized (sparse TF-IDF or dense vectors).
+"""
+import numpy as np
+import scipy.sparse as sp
+
+DEFAULT_BLOCK_ROWS = 1024
+
+
+def _dense_block(a_block, b):
+    product = a_block @ b.T
+    if sp.issparse(product):
+        product = product.toarray()
+    return np.asarray(product, dtype=np.float32)
+
+
+def top_k_similar(a, b=None, k=10, block_rows=DEFAULT_BLOCK_ROWS, min_score=0.0):
+    """Top-k most similar rows of `b` for every row of `a`
+
+    When `b` is None the matrix is compared with itself and self matches are
+    excluded. Returns (indices, scores) arrays of shape (len(a), k); slots
+    without a neighbour above `min_score` hold index -1 and score 0.
+    """
+    self_join = b is None
+    b = a if self_join else b
+    n_rows, n_cols = a.shape[0], b.shape[0]
+    k = max(0, min(k, n_cols - (1 if self_join else 0)))
+
+    indices = np.full((n_rows, k), -1, dtype=np.int32)
+    scores = np.zeros((n_rows, k), dtype=np.float32)
+    if k == 0:
+        return indices, scores
+
+    for start in range(0, n_rows, block_rows):
+        stop = min(start + block_rows, n_rows)
+        block = _dense_block(a[start:stop], b)
+        if self_join:
+            block[np.arange(stop - start), np.arange(start, stop)] = -np.inf
+
+        # argpartition finds the k best in linear time; only those k are sorted
+        candidates = np.argpartition(block, -k, axis=1)[:, -k:]
+        candidate_scores = np.take_along_axis(block, candidates, axis=1)
+        order = np.argsort(-candidate_scores, axis=1)
+        candidates = np.take_along_axis(candidates, order, axis=1)
+        candidate_scores = np.take_along_axis(candidate_scores, order, axis=1)
+
+        keep = candidate_scores > min_score
+        indices[start:stop] = np.where(keep, candidates, -1)
+        scores[start:stop] = np.where(keep, candidate_scores, 0.0)
+
+    return indices, scores
+
+
+def neighbour_pairs(indices, scores, row_ids=None, col_ids=None, undirected=True):
+    """Flatten top-k arrays into {(i, j): score} using optional id mappings"""
+    pairs = {}
+    rows, slots = np.nonzero(indices >= 0)
+    for row, slot in zip(rows, slots):
+        i = int(row_ids[row]) if row_ids is not None else int(row)
+        col = int(indices[row, slot])
+        j = int(col_ids[col]) if col_ids is not None else col
+        if i == j:
+            continue
+        key = (min(i, j), max(i, j)) if undirected else (i, j)
+        score = float(scores[row, slot])
+        if score > pairs.get(key, -1.0):
+            pairs[key] = score
+    return pairs
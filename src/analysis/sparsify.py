@@ -0,0 +1,97 @@
+"""
+Graph sparsification
+Bounds the number of relationship edges so analysis, layout and rendering
+cost grow linearly with the corpus. Three complementary filters:
+per-article top-k caps, a maximum spanning forest backbone that keeps every
+story chain connected through its strongest links, and the disparity filter
+(Serrano et al., 2009) that keeps edges which are significant for at least
+one endpoint given its local weight distribution.
+"""
+import numpy as np
+
+DEFAULT_MAX_DEGREE = 5
+
+
+def _edge_arrays(relationships):
+    first = np.fromiter((rel["article1_id"] for rel in relationships), dtype=np.int64, count=len(relationships))
+    second = np.fromiter((rel["article2_id"] for rel in relationships), dtype=np.int64, count=len(relationships))
+    weights = np.fromiter((rel["strength"] for rel in relationships), dtype=np.float64, count=len(relationships))
+    return first, second, weights
+
+
+def degree_cap(relationships, k=DEFAULT_MAX_DEGREE):
+    """Strongest edges such that no article has more than k of them (at most n*k/2 edges)
+
+    Edges are taken greedily, strongest first, while both endpoints are
+    still below k.
+    """
+    if not relationships:
+        return []
+    first, second, weights = _edge_arrays(relationships)
+    degree = np.zeros(int(max(first.max(), second.max())) + 1, dtype=np.int64)
+
+    kept = []
+    for edge in np.argsort(-weights, kind="stable"):
+        a, b = first[edge], second[edge]
+        if degree[a] < k and degree[b] < k:
+            degree[a] += 1
+            degree[b] += 1
+            kept.append(edge)
+    return [relationships[edge] for edge in sorted(kept)]
+
+
+def maximum_spanning_forest(relationships, n_nodes):
+    """Strongest acyclic subset connecting each component (Kruskal, at most n-1 edges)"""
+    parent = list(range(n_nodes))
+
+    def root(node):
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    forest = []
+    for rel in sorted(relationships, key=lambda x: x["strength"], reverse=True):
+        a, b = root(rel["article1_id"]), root(rel["article2_id"])
+        if a != b:
+            parent[a] = b
+            forest.append(rel)
+            if len(forest) == n_nodes - 1:
+                break
+    return forest
+
+
+def disparity_filter(relationships, alpha=0.05):
+    """Edges whose weight is significant (p < alpha) for at least one endpoint"""
+    if not relationships:
+        return []
+    first, second, weights = _edge_arrays(relationships)
+    n_nodes = int(max(first.max(), second.max())) + 1
+    strength = np.bincount(first, weights, n_nodes) + np.bincount(second, weights, n_nodes)
+    degree = np.bincount(first, minlength=n_nodes) + np.bincount(second, minlength=n_nodes)
+
+    def significance(node):
+        share = np.divide(weights, strength[node], out=np.zeros_like(weights), where=strength[node] > 0)
+        # A node's only edge is always significant for it
+        return np.where(degree[node] > 1, (1.0 - share) ** (degree[node] - 1), 0.0)
+
+    keep = np.minimum(significance(first), significance(second)) < alpha
+    return [rel for rel, kept in zip(relationships, keep) if kept]
+
+
+def sparsify(relationships, n_nodes, k=DEFAULT_MAX_DEGREE, min_strength=0.0, backbone=True, alpha=None):
+    """Prune relationships to an O(n*k) edge budget
+
+    Edges at or above `min_strength` (optionally disparity-filtered) are capped
+    at k per article. With `backbone`, the maximum spanning forest of the
+    edges at or above `min_strength` is added back, so stories split by the
+    cap stay connected; backbone edges may take an article past k links.
+    """
+    strong = [rel for rel in relationships if rel["strength"] >= min_strength]
+    capped = disparity_filter(strong, alpha) if alpha is not None else strong
+    kept = degree_cap(capped, k)
+
+    if backbone:
+        seen = {id(rel) for rel in kept}
+        kept.extend(rel for rel in maximum_spanning_forest(strong, n_nodes) if id(rel) not in seen)
+    return kept
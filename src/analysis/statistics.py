@@ -0,0 +1,142 @@
+"""
+Incremental corpus and graph statistics
+Aggregates are updated as articles and relationships arrive, so the
+dashboard and reports read counts, histograms and date ranges without
+rescanning the corpus.
+"""
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+STRENGTH_BINS = np.linspace(0.0, 1.0, 21)
+STRONG_CONNECTION = 0.7
+
+
+class CorpusStatistics:
+    """Running aggregates over articles and their relationships"""
+
+    def __init__(self):
+        # Corpus aggregates
+        self.total_articles = 0
+        self.by_api = Counter()
+        self.by_source = Counter()
+        self.by_date = Counter()
+        self.date_min = None
+        self.date_max = None
+        self.reset_relationships()
+
+    def reset_relationships(self):
+        """Forget graph aggregates (called before a new analysis run)"""
+        self.total_relationships = 0
+        self.by_type = Counter()
+        self.strength_histogram = np.zeros(len(STRENGTH_BINS) - 1, dtype=np.int64)
+        self.strength_sum = 0.0
+        self.strength_max = None
+        self.strong_connections = 0
+        self.degrees = np.zeros(max(self.total_articles, 1), dtype=np.int64)
+
+    @classmethod
+    def from_articles(cls, articles_df):
+        stats = cls()
+        stats.add_articles(articles_df)
+        return stats
+
+    def add_articles(self, articles):
+        """Fold a chunk of articles (DataFrame or list of dicts) into the aggregates"""
+        articles_df = articles if isinstance(articles, pd.DataFrame) else pd.DataFrame(articles)
+        if articles_df.empty:
+            return
+
+        self.total_articles += len(articles_df)
+        self.by_api.update(articles_df["source_api"].value_counts().to_dict())
+        self.by_source.update(articles_df["source_name"].value_counts().to_dict())
+
+        dates = pd.to_datetime(articles_df["published_at"], errors="coerce", utc=True, format="mixed").dropna()
+        if not dates.empty:
+            self.by_date.update(dates.dt.date.value_counts().to_dict())
+            chunk_min, chunk_max = dates.min(), dates.max()
+            self.date_min = chunk_min if self.date_min is None else min(self.date_min, chunk_min)
+            self.date_max = chunk_max if self.date_max is None else max(self.date_max, chunk_max)
+
+        if len(self.degrees) < self.total_articles:
+            self.degrees = np.pad(self.degrees, (0, self.total_articles - len(self.degrees)))
+
+    def add_relationships(self, relationships):
+        """Fold a batch of relationship dicts into the graph aggregates"""
+        if not relationships:
+            return
+
+        count = len(relationships)
+        strengths = np.fromiter((rel["strength"] for rel in relationships), dtype=np.float64, count=count)
+        sources = np.fromiter((rel["article1_id"] for rel in relationships), dtype=np.int64, count=count)
+        targets = np.fromiter((rel["article2_id"] for rel in relationships), dtype=np.int64, count=count)
+
+        self.total_relationships += count
+        self.by_type.update(rel["type"] for rel in relationships)
+        self.strength_histogram += np.histogram(np.clip(strengths, 0.0, 1.0), bins=STRENGTH_BINS)[0]
+        self.strength_sum += float(strengths.sum())
+        batch_max = float(strengths.max())
+        self.strength_max = batch_max if self.strength_max is None else max(self.strength_max, batch_max)
+        self.strong_connections += int((strengths > STRONG_CONNECTION).sum())
+
+        size = int(max(sources.max(), targets.max())) + 1
+        if len(self.degrees) < size:
+            self.degrees = np.pad(self.degrees, (0, size - len(self.degrees)))
+        self.degrees += np.bincount(sources, minlength=len(self.degrees))
+        self.degrees += np.bincount(targets, minlength=len(self.degrees))
+
+    # Derived values
+
+    @property
+    def api_count(self):
+        return len(self.by_api)
+
+    @property
+    def source_count(self):
+        return len(self.by_source)
+
+    @property
+    def avg_strength(self):
+        return self.strength_sum / self.total_relationships if self.total_relationships else 0.0
+
+    @property
+    def density(self):
+        n = self.total_articles
+        return self.total_relationships / (n * (n - 1) / 2) if n > 1 else 0.0
+
+    def degree_distribution(self):
+        """Mapping degree -> number of articles with that degree"""
+        counts = np.bincount(self.degrees[:self.total_articles]) if self.total_articles else np.array([])
+        return {degree: int(n) for degree, n in enumerate(counts) if n}
+
+    def timeline(self):
+        """Articles per publication day as a sorted Series"""
+        return pd.Series(self.by_date).sort_index()
+
+    def snapshot(self, top_sources=10):
+        """Plain-dict view of every aggregate (JSON serializable)"""
+        return {
+            "corpus": {
+                "total_articles": self.total_articles,
+                "api_sources": self.api_count,
+                "news_sources": self.source_count,
+                "date_min": self.date_min.isoformat() if self.date_min is not None else None,
+                "date_max": self.date_max.isoformat() if self.date_max is not None else None,
+                "by_api": dict(self.by_api.most_common()),
+                "top_sources": dict(self.by_source.most_common(top_sources)),
+            },
+            "graph": {
+                "total_relationships": self.total_relationships,
+                "density": self.density,
+                "by_type": dict(self.by_type.most_common()),
+                "avg_strength": self.avg_strength,
+                "max_strength": self.strength_max,
+                "strong_connections": self.strong_connections,
+                "strength_histogram": {
+                    f"{low:.2f}-{high:.2f}": int(count)
+                    for low, high, count in zip(STRENGTH_BINS[:-1], STRENGTH_BINS[1:], self.strength_histogram)
+                },
+                "degree_distribution": self.degree_distribution(),
+            },
+        }
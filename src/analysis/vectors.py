@@ -0,0 +1,74 @@
+"""
+Article term vectors
+Articles are vectorized in one shared, stateless hashed feature space, so the
+term counts of an article never depend on the rest of the corpus. Counts are
+cached per content hash; only new or changed articles are tokenized again.
+IDF weighting is applied per corpus on top of the cached counts.
+"""
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+
+from src.data_collection.fingerprint import StageCache, content_hash
+
+N_FEATURES = 2 ** 18
+
+# Every corpus and shard shares this feature space, so vectors built at
+# different times can be compared directly
+_vectorizer = HashingVectorizer(
+    n_features=N_FEATURES,
+    stop_words="english",
+    alternate_sign=False,
+    norm=None,
+)
+
+_count_cache = StageCache("vectors", persistent=False, max_entries=100000)
+
+
+def article_text(article):
+    """Title + Description + Content"""
+    return f"{article.get('title') or ''} {article.get('description') or ''} {article.get('content') or ''}"
+
+
+def term_counts(articles, cache=None):
+    """Hashed term counts (CSR, one row per article), tokenizing only uncached articles"""
+    cache = cache if cache is not None else _count_cache
+    digests = [content_hash(article) for article in articles]
+    cached = cache.get_many(set(digests))
+
+    pending = {}
+    for article, digest in zip(articles, digests):
+        if cached.get(digest) is None and digest not in pending:
+            pending[digest] = article_text(article)
+    if pending:
+        counts = _vectorizer.transform(pending.values()).tocsr()
+        found = {
+            digest: (counts.indices[counts.indptr[row]:counts.indptr[row + 1]].astype(np.int32),
+                     counts.data[counts.indptr[row]:counts.indptr[row + 1]].astype(np.float32))
+            for row, digest in enumerate(pending)
+        }
+        cache.set_many(found)
+        cached.update(found)
+
+    rows = [cached[digest] for digest in digests]
+    lengths = np.fromiter((len(indices) for indices, _ in rows), dtype=np.int64, count=len(rows))
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=indptr[1:])
+    indices = np.concatenate([r[0] for r in rows]) if rows else np.empty(0, dtype=np.int32)
+    data = np.concatenate([r[1] for r in rows]) if rows else np.empty(0, dtype=np.float32)
+    return sp.csr_matrix((data, indices, indptr), shape=(len(rows), N_FEATURES))
+
+
+def tfidf(counts):
+    """Sublinear, L2-normalized TF-IDF weighting of term counts"""
+    return TfidfTransformer(sublinear_tf=True).fit_transform(counts).astype(np.float32)
+
+
+def tfidf_vectors(articles):
+    """TF-IDF vectors of articles in the shared hashed space"""
+    return tfidf(term_counts(articles))
+
+
+def vectorize(texts):
+    """TF-IDF vectors of free texts (e.g. search queries), uncached"""
+    return tfidf(_vectorizer.transform(texts))
@@ -0,0 +1,3 @@
+"""
+News collection: HTTP plumbing and provider integrations
+"""
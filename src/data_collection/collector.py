@@ -0,0 +1,204 @@
+"""
+Collection orchestrator
+Runs every configured provider adapter concurrently with shared response
+caching, client-side rate limiting, pagination and relevance filtering.
+"""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from src.data_collection.fingerprint import content_hash
+from src.data_collection.matcher import compile_query
+
+
+class ResponseCache:
+    """Thread-safe LRU cache of provider pages with a time-to-live"""
+
+    def __init__(self, ttl=900, max_entries=512):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class QuotaExceeded(Exception):
+    """Raised when a provider's daily request allowance is used up"""
+
+
+class RateLimiter:
+    """Spaces requests to one provider and tracks its daily quota"""
+
+    def __init__(self, requests_per_second=None, daily_quota=None):
+        self.min_interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self.daily_quota = daily_quota
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+        self._day = None
+        self._used = 0
+
+    def acquire(self):
+        """Block until the next request may be sent"""
+        with self._lock:
+            today = time.strftime("%Y-%m-%d")
+            if today != self._day:
+                self._day, self._used = today, 0
+            if self.daily_quota is not None and self._used >= self.daily_quota:
+                raise QuotaExceeded(f"daily quota of {self.daily_quota} requests used")
+            self._used += 1
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.min_interval
+        if wait > 0:
+            time.sleep(wait)
+
+    def remaining(self):
+        if self.daily_quota is None:
+            return None
+        return max(0, self.daily_quota - self._used)
+
+
+_response_cache = ResponseCache()
+_rate_limiters = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider):
+    """Rate limiter shared by every instance of the same provider"""
+    key = (provider.name, provider.label)
+    with _rate_limiters_lock:
+        if key not in _rate_limiters:
+            _rate_limiters[key] = RateLimiter(provider.requests_per_second, provider.daily_quota)
+        return _rate_limiters[key]
+
+
+def is_relevant_article(article, query):
+    """Check if article is relevant to the search query"""
+    return compile_query(query or "").matches(article)
+
+
+def remove_duplicates(articles):
+    """Remove duplicate articles based on title similarity"""
+    unique_articles = []
+    seen_titles = set()
+    seen_hashes = set()
+
+    for article in articles:
+        # Identical articles from overlapping queries are dropped without comparing titles
+        digest = content_hash(article)
+        if digest in seen_hashes:
+            continue
+        seen_hashes.add(digest)
+
+        title_lower = article["title"].lower()
+        # Simple deduplication - check if similar title exists
+        is_duplicate = False
+        for seen_title in seen_titles:
+            if len(set(title_lower.split()) & set(seen_title.split())) > len(title_lower.split()) * 0.7:
+                is_duplicate = True
+                break
+
+        if not is_duplicate:
+            unique_articles.append(article)
+            seen_titles.add(title_lower)
+
+    return unique_articles
+
+
+def collect_from_provider(provider, query, from_date, max_articles, cache=None):
+    """Walk one provider's pages until `max_articles` relevant articles are found
+
+    Returns (articles, error). When a page fails, the articles from the
+    pages fetched before it are kept and the error message is returned.
+    """
+    cache = cache if cache is not None else _response_cache
+    limiter = get_rate_limiter(provider)
+    matcher = compile_query(query or "")
+    page_size = min(max_articles, provider.page_size, provider.max_page_size)
+    articles = []
+    cursor = None
+    pages = 0
+
+    while len(articles) < max_articles:
+        if provider.max_pages is not None and pages >= provider.max_pages:
+            break
+
+        try:
+            key = provider.cache_key(query, from_date, page_size, cursor)
+            data = cache.get(key) if key is not None else None
+            if data is None:
+                limiter.acquire()
+                data = provider.fetch_page(query, from_date, page_size, cursor)
+                if key is not None:
+                    cache.set(key, data)
+            pages += 1
+
+            page = [provider.normalize(raw) for raw in provider.extract_items(data)]
+            cursor = provider.next_cursor(data, cursor, page_size)
+        except Exception as e:
+            return articles, str(e)
+
+        # Filter articles to ensure they contain the query terms
+        relevant = matcher.filter_batch([article for article in page if article])
+        articles.extend(relevant[:max_articles - len(articles)])
+
+        if cursor is None:
+            break
+
+    return articles, None
+
+
+def collect_articles(query, from_date, max_articles, providers, progress_callback=None):
+    """Collect from all providers concurrently
+
+    Returns (unique_articles, report) where report holds one entry per
+    provider with its label, article count and error message (if any).
+    `progress_callback(done, total, label)` is invoked from the calling thread.
+    """
+    results = {}
+    if not providers:
+        return [], []
+
+    with ThreadPoolExecutor(max_workers=len(providers)) as executor:
+        futures = {
+            executor.submit(collect_from_provider, provider, query, from_date, max_articles): index
+            for index, provider in enumerate(providers)
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            index = futures[future]
+            try:
+                results[index] = future.result()
+            except Exception as e:
+                results[index] = ([], str(e))
+            if progress_callback:
+                progress_callback(done, len(providers), providers[index].label)
+
+    # Merge in configuration order so results do not depend on response timing
+    all_articles = []
+    report = []
+    for index, provider in enumerate(providers):
+        articles, error = results[index]
+        all_articles.extend(articles)
+        report.append({"provider": provider.name, "label": provider.label, "count": len(articles), "error": error})
+
+    # Remove duplicates based on title similarity
+    return remove_duplicates(all_articles), report
@@ -0,0 +1,103 @@
+"""
+Article content hashes and per-stage caches
+Every article gets a stable content hash when it is normalized (URL plus
+normalized title and body). Expensive pipeline stages store their per-article
+results under that hash, so articles seen in earlier or overlapping queries
+skip relevance filtering, vectorization and entity extraction.
+"""
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[2] / "data" / "processed" / "cache"
+DEFAULT_MAX_ENTRIES = 200000
+
+_whitespace = re.compile(r"\s+")
+
+
+def normalize_text(text):
+    """Case- and whitespace-insensitive form of a text field"""
+    return _whitespace.sub(" ", str(text or "")).strip().casefold()
+
+
+def compute_hash(article):
+    """Digest of an article's URL, title and body"""
+    parts = [
+        str(article.get("url") or "").strip(),
+        normalize_text(article.get("title")),
+        normalize_text(article.get("description")),
+        normalize_text(article.get("content")),
+    ]
+    return hashlib.blake2b("\n".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def content_hash(article):
+    """Hash assigned at ingestion, computed on the fly for older records"""
+    digest = article.get("content_hash")
+    return digest if isinstance(digest, str) and digest else compute_hash(article)
+
+
+def corpus_digest(hashes):
+    """Order-independent digest of a set of articles"""
+    digest = hashlib.blake2b(digest_size=16)
+    for value in sorted(hashes):
+        digest.update(value.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class StageCache:
+    """Results of one pipeline stage keyed by content hash
+
+    Persistent caches live on disk (diskcache when installed); others are a
+    bounded in-memory LRU shared by every session of the server process.
+    """
+
+    def __init__(self, stage, namespace="", persistent=True, directory=None, max_entries=DEFAULT_MAX_ENTRIES):
+        self.stage = stage
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._store = OrderedDict()
+        self._disk = False
+        if persistent:
+            try:
+                import diskcache
+                self._store = diskcache.Cache(str(directory or DEFAULT_CACHE_DIR / stage))
+                self._disk = True
+            except ImportError:
+                pass
+
+    def _key(self, digest):
+        return f"{self.namespace}:{digest}"
+
+    def get_many(self, digests):
+        if self._disk:
+            return {digest: self._store.get(self._key(digest)) for digest in digests}
+        with self._lock:
+            found = {}
+            for digest in digests:
+                key = self._key(digest)
+                found[digest] = self._store.get(key)
+                if found[digest] is not None:
+                    self._store.move_to_end(key)
+            return found
+
+    def set_many(self, items):
+        if self._disk:
+            for digest, value in items.items():
+                self._store[self._key(digest)] = value
+            return
+        with self._lock:
+            for digest, value in items.items():
+                self._store[self._key(digest)] = value
+                self._store.move_to_end(self._key(digest))
+            while len(self._store) > self.max_entries:
+                self._store.popitem(last=False)
+
+    def get(self, digest):
+        return self.get_many([digest])[digest]
+
+    def set(self, digest, value):
+        self.set_many({digest: value})
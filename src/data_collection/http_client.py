@@ -0,0 +1,165 @@
+"""
+Shared HTTP client for news providers
+Pooled keep-alive sessions (sync and async) with compressed transfers
+"""
+import asyncio
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import brotli  # noqa: F401  (enables "br" decoding in urllib3/aiohttp)
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+# Connect and read timeouts are tuned separately: connecting should fail fast,
+# while a large result page may legitimately take a while to stream back
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 15
+DEFAULT_TIMEOUT = (CONNECT_TIMEOUT, READ_TIMEOUT)
+
+# Keep-alive connections kept open per provider host
+HOST_POOL_SIZES = {
+    "newsapi.org": 4,
+    "content.guardianapis.com": 8,
+    "newsdata.io": 2,
+}
+DEFAULT_POOL_SIZE = 4
+KEEPALIVE_TIMEOUT = 30
+
+DEFAULT_HEADERS = {
+    "Accept": "application/json",
+    "Accept-Encoding": ACCEPT_ENCODING,
+    "Connection": "keep-alive",
+    "User-Agent": "NewsGraph/1.0",
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _retry_policy():
+    """Retry transient failures and honour Retry-After on 429/503"""
+    return Retry(
+        total=2,
+        connect=2,
+        read=1,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(["GET"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+
+
+def create_session(host_pool_sizes=None):
+    """Build a requests session with a tuned connection pool per provider host"""
+    # Each session owns its copy, so registering a host never touches the defaults
+    host_pool_sizes = dict(host_pool_sizes or HOST_POOL_SIZES)
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    session.host_pool_sizes = host_pool_sizes
+
+    default_adapter = HTTPAdapter(
+        pool_connections=len(host_pool_sizes) + 1,
+        pool_maxsize=DEFAULT_POOL_SIZE,
+        max_retries=_retry_policy(),
+    )
+    session.mount("https://", default_adapter)
+    session.mount("http://", default_adapter)
+
+    # Longest prefix wins in requests, so host-specific adapters take precedence
+    for host, pool_size in host_pool_sizes.items():
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=_retry_policy())
+        session.mount(f"https://{host}/", adapter)
+
+    return session
+
+
+def get_session():
+    """Return the process-wide pooled session, creating it on first use"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+
+def register_host(host, pool_size=DEFAULT_POOL_SIZE):
+    """Give a host its own connection pool on the shared session"""
+    session = get_session()
+    session.host_pool_sizes[host] = pool_size
+    session.mount(
+        f"https://{host}/",
+        HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=_retry_policy()),
+    )
+
+
+def http_get(url, params=None, timeout=DEFAULT_TIMEOUT, **kwargs):
+    """GET through the shared session (connection reuse, gzip/brotli, split timeouts)"""
+    return get_session().get(url, params=params, timeout=timeout, **kwargs)
+
+
+def close_session():
+    """Close pooled connections (mainly for tests and shutdown)"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+class AsyncHTTPClient:
+    """Async counterpart of the shared session, built on aiohttp
+
+    Usage:
+        async with AsyncHTTPClient() as client:
+            status, data = await client.get_json(url, params)
+    """
+
+    def __init__(self, host_pool_sizes=None, timeout=DEFAULT_TIMEOUT):
+        self.host_pool_sizes = dict(host_pool_sizes or HOST_POOL_SIZES)
+        self.connect_timeout, self.read_timeout = timeout
+        self._session = None
+        self._host_limits = {}
+
+    async def __aenter__(self):
+        import aiohttp
+
+        connector = aiohttp.TCPConnector(
+            limit=sum(self.host_pool_sizes.values()) + DEFAULT_POOL_SIZE,
+            limit_per_host=max(self.host_pool_sizes.values(), default=DEFAULT_POOL_SIZE),
+            keepalive_timeout=KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=300,
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            headers=DEFAULT_HEADERS,
+            timeout=aiohttp.ClientTimeout(sock_connect=self.connect_timeout, sock_read=self.read_timeout),
+            auto_decompress=True,
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._session.close()
+        self._session = None
+
+    def _host_limit(self, url):
+        """Per-host semaphore mirroring the sync pool sizes"""
+        host = urlsplit(url).hostname or ""
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.host_pool_sizes.get(host, DEFAULT_POOL_SIZE))
+        return self._host_limits[host]
+
+    async def get_json(self, url, params=None):
+        """GET a JSON document, returning (status_code, data or None)"""
+        async with self._host_limit(url):
+            async with self._session.get(url, params=params) as response:
+                if response.status != 200:
+                    return response.status, None
+                return response.status, await response.json(content_type=None)
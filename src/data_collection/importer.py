@@ -0,0 +1,254 @@
+"""
+Offline corpus import
+Streams bulk JSONL, CSV or Parquet dumps of articles in fixed-size chunks,
+normalizes every row to the collector article schema and drops duplicates
+incrementally, so arbitrarily large files are read with bounded memory.
+"""
+import bz2
+import gzip
+import hashlib
+import io
+import json
+import lzma
+import re
+from pathlib import Path
+
+import pandas as pd
+
+from src.data_collection.providers import ARTICLE_FIELDS, make_article
+
+DEFAULT_CHUNK_SIZE = 10000
+SUPPORTED_FORMATS = ("jsonl", "csv", "parquet")
+
+# Compressed JSONL and CSV dumps; Parquet compresses internally
+COMPRESSIONS = {"gz": "gzip", "bz2": "bz2", "xz": "xz"}
+_openers = {"gzip": gzip.open, "bz2": bz2.open, "xz": lzma.open}
+
+# Column names used by common dumps, mapped onto the article schema
+FIELD_ALIASES = {
+    "title": ["title", "headline", "webTitle"],
+    "description": ["description", "summary", "trailText", "abstract"],
+    "source_name": ["source_name", "source", "source_id", "publisher"],
+    "source_api": ["source_api", "provider"],
+    "published_at": ["published_at", "publishedAt", "pubDate", "webPublicationDate", "date"],
+    "url": ["url", "link", "webUrl"],
+    "author": ["author", "byline", "creator"],
+    "content": ["content", "body", "bodyText", "text"],
+}
+
+_punctuation = re.compile(r"[^\w\s]")
+_whitespace = re.compile(r"\s+")
+
+
+def detect_format(name):
+    """Infer the dump format from a file name (gz, bz2 and xz suffixes ignored)"""
+    suffixes = [s.lower().lstrip(".") for s in Path(str(name)).suffixes]
+    compressed = bool(suffixes) and suffixes[-1] in COMPRESSIONS
+    fmt = suffixes[-2 if compressed else -1] if len(suffixes) > compressed else ""
+    if fmt in ("json", "ndjson"):
+        fmt = "jsonl"
+    if fmt == "pq":
+        fmt = "parquet"
+    if fmt not in SUPPORTED_FORMATS or (compressed and fmt == "parquet"):
+        raise ValueError(f"Unsupported import format: {name}")
+    return fmt
+
+
+def _compression(source):
+    """Compression of a path or file object, inferred from its (file) name"""
+    name = str(getattr(source, "name", source) or "").lower()
+    return COMPRESSIONS.get(name.rsplit(".", 1)[-1]) if "." in name else None
+
+
+def _open_text(source):
+    """Open a path or binary file object as text, transparently decompressing"""
+    compression = _compression(source)
+    if compression is not None:
+        return _openers[compression](source, "rt", encoding="utf-8")
+    if hasattr(source, "read"):
+        return io.TextIOWrapper(source, encoding="utf-8")
+    return open(source, encoding="utf-8")
+
+
+def iter_jsonl(source, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield lists of raw records from a JSON-lines file"""
+    chunk = []
+    with _open_text(source) as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            chunk.append(json.loads(line))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_csv(source, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield lists of raw records from a CSV file"""
+    reader = pd.read_csv(
+        source,
+        chunksize=chunk_size,
+        dtype=str,
+        keep_default_na=False,
+        compression=_compression(source),
+    )
+    for frame in reader:
+        yield frame.to_dict("records")
+
+
+def iter_parquet(source, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield lists of raw records from a Parquet file, one record batch at a time"""
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(source)
+    for batch in parquet_file.iter_batches(batch_size=chunk_size):
+        yield batch.to_pylist()
+
+
+READERS = {
+    "jsonl": iter_jsonl,
+    "csv": iter_csv,
+    "parquet": iter_parquet,
+}
+
+
+def _as_text(value):
+    if value is None:
+        return ""
+    if isinstance(value, float) and value != value:  # NaN
+        return ""
+    if isinstance(value, (list, tuple)):
+        return ", ".join(str(v) for v in value)
+    if isinstance(value, dict):
+        return value.get("name") or value.get("id") or ""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def normalize_record(raw, field_map=None, default_source_api="import"):
+    """Map one raw row onto the article schema (None when it has no title)"""
+    field_map = field_map or {}
+    fields = {}
+    for field in FIELD_ALIASES:
+        candidates = [field_map[field]] if field in field_map else FIELD_ALIASES[field]
+        value = ""
+        for column in candidates:
+            if column in raw:
+                value = _as_text(raw[column])
+                if value:
+                    break
+        fields[field] = value.strip()
+
+    if not fields["title"]:
+        return None
+    fields["source_api"] = fields["source_api"] or default_source_api
+    fields["source_name"] = fields["source_name"] or "Unknown"
+    return make_article(**fields)
+
+
+def title_key(title):
+    """Normalized title used for exact duplicate detection"""
+    title = _punctuation.sub(" ", title.lower())
+    return _whitespace.sub(" ", title).strip()
+
+
+class IncrementalDeduplicator:
+    """Remembers 8-byte digests of seen URLs and titles across chunks"""
+
+    def __init__(self):
+        self._seen = set()
+
+    @classmethod
+    def from_articles(cls, articles_df):
+        """Deduplicator that already knows every article of a corpus (e.g. before appending to it)"""
+        deduplicator = cls()
+        urls = articles_df["url"] if "url" in articles_df else [""] * len(articles_df)
+        for title, url in zip(articles_df["title"], urls):
+            deduplicator._seen.update(deduplicator._keys(_as_text(title), _as_text(url)))
+        return deduplicator
+
+    @staticmethod
+    def _digest(text):
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+
+    def _keys(self, title, url):
+        keys = [self._digest("t:" + title_key(title))]
+        if url:
+            keys.append(self._digest("u:" + url))
+        return keys
+
+    def is_new(self, article):
+        keys = self._keys(article["title"], article.get("url"))
+        if any(key in self._seen for key in keys):
+            return False
+        self._seen.update(keys)
+        return True
+
+    def __len__(self):
+        return len(self._seen)
+
+
+class ImportStats:
+    """Running counters for an import"""
+
+    def __init__(self):
+        self.rows_read = 0
+        self.rows_skipped = 0
+        self.duplicates = 0
+        self.imported = 0
+
+    def as_dict(self):
+        return {
+            "rows_read": self.rows_read,
+            "rows_skipped": self.rows_skipped,
+            "duplicates": self.duplicates,
+            "imported": self.imported,
+        }
+
+
+def import_articles(source, fmt=None, chunk_size=DEFAULT_CHUNK_SIZE, field_map=None,
+                    limit=None, deduplicator=None, stats=None):
+    """Stream a dump as DataFrames of normalized, deduplicated articles
+
+    `source` is a path or a binary file object (e.g. a Streamlit upload).
+    Pass a shared `deduplicator` to dedup across several files, and a
+    `stats` object to observe progress.
+    """
+    fmt = fmt or detect_format(getattr(source, "name", source))
+    reader = READERS[fmt]
+    deduplicator = deduplicator if deduplicator is not None else IncrementalDeduplicator()
+    stats = stats if stats is not None else ImportStats()
+    default_source_api = f"import:{fmt}"
+
+    for raw_chunk in reader(source, chunk_size):
+        articles = []
+        for raw in raw_chunk:
+            stats.rows_read += 1
+            article = normalize_record(raw, field_map, default_source_api)
+            if article is None:
+                stats.rows_skipped += 1
+                continue
+            if not deduplicator.is_new(article):
+                stats.duplicates += 1
+                continue
+            articles.append(article)
+            if limit is not None and stats.imported + len(articles) >= limit:
+                break
+
+        stats.imported += len(articles)
+        if articles:
+            yield pd.DataFrame(articles, columns=ARTICLE_FIELDS)
+        if limit is not None and stats.imported >= limit:
+            return
+
+
+def load_corpus(source, fmt=None, chunk_size=DEFAULT_CHUNK_SIZE, field_map=None, limit=None):
+    """Import a dump into a single DataFrame ready for the analysis pipeline"""
+    stats = ImportStats()
+    chunks = list(import_articles(source, fmt, chunk_size, field_map, limit, stats=stats))
+    if not chunks:
+        return pd.DataFrame(columns=ARTICLE_FIELDS), stats
+    return pd.concat(chunks, ignore_index=True), stats
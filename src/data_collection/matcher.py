@@ -0,0 +1,280 @@
+"""
+Compiled query matcher for article relevance
+A query is parsed once into terms (words or quoted phrases) and an optional
+boolean expression, and compiled into a token-level Aho-Corasick automaton.
+Each article is tokenized and stemmed once, then scanned in a single pass
+that reports every query term it contains, on whole-word boundaries only
+("war" does not match "software").
+
+Query syntax:
+    climate change            all terms (70% of terms for longer queries)
+    "climate change" policy   quoted phrases match consecutive words
+    +required -excluded       force or forbid a term
+    ai AND (ethics OR safety) NOT crypto   explicit boolean expressions
+
+Decisions are remembered per content hash, so articles returned again by
+repeated or overlapping queries are not re-scanned.
+"""
+import re
+from collections import deque
+from functools import lru_cache
+
+from src.data_collection.fingerprint import StageCache, content_hash
+
+try:
+    from nltk.stem.porter import PorterStemmer
+    _porter = PorterStemmer()
+except ImportError:
+    _porter = None
+
+_token_pattern = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+_query_pattern = re.compile(r'"([^"]*)"|(\()|(\))|([+-]?)([^\s()"]+)')
+OPERATORS = {"AND", "OR", "NOT"}
+
+# Fraction of terms an article must contain when the query has more than 3 terms
+DEFAULT_MIN_SHOULD_MATCH = 0.7
+
+# Relevance decisions remembered per compiled query
+RELEVANCE_CACHE_SIZE = 50000
+
+
+@lru_cache(maxsize=200000)
+def stem(token):
+    """Reduce a lowercase token to its stem (Porter when nltk is installed)"""
+    if _porter is not None:
+        return _porter.stem(token)
+    token = token.replace("'s", "")
+    for suffix, replacement in (("ies", "y"), ("ing", ""), ("ed", ""), ("es", ""), ("s", "")):
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3 and not token.endswith("ss"):
+            return token[:-len(suffix)] + replacement
+    return token
+
+
+def tokenize(text):
+    """Lowercase, split on non-word characters and stem"""
+    return [stem(token) for token in _token_pattern.findall(text.lower())]
+
+
+def article_text(article):
+    """Text of an article considered for relevance"""
+    return f"{article.get('title') or ''} {article.get('description') or ''} {article.get('content') or ''}"
+
+
+class TermAutomaton:
+    """Aho-Corasick automaton over stemmed token sequences"""
+
+    def __init__(self, terms):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        for term_id, tokens in enumerate(terms):
+            self._add(term_id, tokens)
+        self._build_links()
+
+    def _add(self, term_id, tokens):
+        state = 0
+        for token in tokens:
+            if token not in self.goto[state]:
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+                self.goto[state][token] = len(self.goto) - 1
+            state = self.goto[state][token]
+        self.output[state].append(term_id)
+
+    def _build_links(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and token not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(token, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def find(self, tokens):
+        """Set of term ids occurring anywhere in `tokens`"""
+        goto, fail, output = self.goto, self.fail, self.output
+        found = set()
+        state = 0
+        for token in tokens:
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+
+class QueryMatcher:
+    """Relevance test for one query, compiled once and reused for every article"""
+
+    def __init__(self, query, min_should_match=DEFAULT_MIN_SHOULD_MATCH):
+        self.query = query or ""
+        self.terms = []            # stemmed token tuples
+        self._term_ids = {}
+        self.required = set()
+        self.excluded = set()
+        self.optional = []
+        self.expression = None
+        self._parse(self.query)
+
+        self.automaton = TermAutomaton(self.terms)
+        self.decisions = StageCache("relevance", namespace=self.query, persistent=False,
+                                    max_entries=RELEVANCE_CACHE_SIZE)
+        count = len(self.optional)
+        self.required_matches = count if count <= 3 else max(1, int(count * min_should_match))
+
+    # Parsing
+
+    def _term_id(self, text):
+        tokens = tuple(tokenize(text))
+        if not tokens:
+            return None
+        if tokens not in self._term_ids:
+            self._term_ids[tokens] = len(self.terms)
+            self.terms.append(tokens)
+        return self._term_ids[tokens]
+
+    def _lex(self, query):
+        items = []
+        for phrase, open_paren, close_paren, sign, word in _query_pattern.findall(query):
+            if open_paren or close_paren:
+                items.append(("paren", open_paren or close_paren))
+            elif word in OPERATORS:
+                items.append(("op", word))
+            else:
+                term_id = self._term_id(phrase if not word else word)
+                if term_id is not None:
+                    items.append(("term", term_id, sign))
+        return items
+
+    def _parse(self, query):
+        items = self._lex(query)
+        if any(item[0] in ("op", "paren") for item in items):
+            self.expression, _ = self._parse_or(items, 0)
+            return
+        # Simple mode: +/- prefixes, everything else is an optional term
+        for _, term_id, sign in items:
+            if sign == "+":
+                self.required.add(term_id)
+            elif sign == "-":
+                self.excluded.add(term_id)
+            elif term_id not in self.optional:
+                self.optional.append(term_id)
+
+    def _parse_or(self, items, pos):
+        node, pos = self._parse_and(items, pos)
+        while pos < len(items) and items[pos] == ("op", "OR"):
+            right, pos = self._parse_and(items, pos + 1)
+            node = ("or", node, right)
+        return node, pos
+
+    def _parse_and(self, items, pos):
+        node, pos = self._parse_not(items, pos)
+        while pos < len(items) and items[pos] != ("op", "OR") and items[pos] != ("paren", ")"):
+            if items[pos] == ("op", "AND"):
+                pos += 1
+            right, pos = self._parse_not(items, pos)
+            node = ("and", node, right)
+        return node, pos
+
+    def _parse_not(self, items, pos):
+        if pos < len(items) and items[pos] == ("op", "NOT"):
+            operand, pos = self._parse_not(items, pos + 1)
+            return ("not", operand), pos
+        return self._parse_atom(items, pos)
+
+    def _parse_atom(self, items, pos):
+        if pos >= len(items):
+            return ("true",), pos
+        item = items[pos]
+        if item == ("paren", "("):
+            node, pos = self._parse_or(items, pos + 1)
+            if pos < len(items) and items[pos] == ("paren", ")"):
+                pos += 1
+            return node, pos
+        if item[0] == "term":
+            _, term_id, sign = item
+            node = ("term", term_id)
+            return (("not", node) if sign == "-" else node), pos + 1
+        # Stray operator or closing parenthesis: skip it
+        return self._parse_atom(items, pos + 1)
+
+    def _evaluate(self, node, found):
+        kind = node[0]
+        if kind == "term":
+            return node[1] in found
+        if kind == "and":
+            return self._evaluate(node[1], found) and self._evaluate(node[2], found)
+        if kind == "or":
+            return self._evaluate(node[1], found) or self._evaluate(node[2], found)
+        if kind == "not":
+            return not self._evaluate(node[1], found)
+        return True
+
+    # Matching
+
+    @property
+    def is_empty(self):
+        return not self.terms
+
+    def found_terms(self, article):
+        """Ids of query terms present in the article"""
+        return self.automaton.find(tokenize(article_text(article)))
+
+    def _decide(self, found):
+        if self.expression is not None:
+            return self._evaluate(self.expression, found)
+        if self.excluded & found or not self.required <= found:
+            return False
+        matched = sum(1 for term_id in self.optional if term_id in found)
+        return matched >= self.required_matches
+
+    def _score(self, found):
+        if not self.terms:
+            return 1.0
+        positive = [t for t in range(len(self.terms)) if t not in self.excluded]
+        if not positive:
+            return 1.0
+        return sum(1 for t in positive if t in found) / len(positive)
+
+    def matches(self, article):
+        """True when the article satisfies the query"""
+        if self.is_empty:
+            return True
+        return self._decide(self.found_terms(article))
+
+    def score(self, article):
+        """Fraction of (non-excluded) query terms found, or 0.0 when the query is not satisfied"""
+        if self.is_empty:
+            return 1.0
+        found = self.found_terms(article)
+        return self._score(found) if self._decide(found) else 0.0
+
+    def score_batch(self, articles):
+        """Scores for a page of articles, each tokenized exactly once"""
+        return [self.score(article) for article in articles]
+
+    def filter_batch(self, articles):
+        """Articles of a page that satisfy the query, in order"""
+        if self.is_empty:
+            return list(articles)
+        digests = [content_hash(article) for article in articles]
+        decisions = self.decisions.get_many(digests)
+        fresh = {}
+        for article, digest in zip(articles, digests):
+            if decisions[digest] is None and digest not in fresh:
+                fresh[digest] = self._decide(self.found_terms(article))
+        if fresh:
+            self.decisions.set_many(fresh)
+            decisions.update(fresh)
+        return [article for article, digest in zip(articles, digests) if decisions[digest]]
+
+
+@lru_cache(maxsize=256)
+def compile_query(query):
+    """Cached QueryMatcher for a query string"""
+    return QueryMatcher(query)
@@ -0,0 +1,381 @@
+"""
+News provider adapters
+Each adapter knows how to build a query, walk pagination and normalize a
+provider response into the common article schema. Adapters are registered
+by name and instantiated from config/providers.py.
+"""
+import json
+import xml.etree.ElementTree as ET
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+
+from src.data_collection.fingerprint import compute_hash
+from src.data_collection.http_client import http_get
+
+# Common article schema produced by every adapter
+ARTICLE_FIELDS = [
+    "title",
+    "description",
+    "source_name",
+    "source_api",
+    "published_at",
+    "url",
+    "author",
+    "content",
+    "content_hash",
+]
+
+PROVIDER_REGISTRY = {}
+
+
+def register_provider(name):
+    """Class decorator adding an adapter to the registry under `name`"""
+    def decorator(cls):
+        cls.name = name
+        PROVIDER_REGISTRY[name] = cls
+        return cls
+    return decorator
+
+
+class ProviderError(Exception):
+    """Raised when a provider returns an unusable response"""
+
+
+def make_article(**fields):
+    """Build an article dict with every schema field present and its content hash"""
+    article = {field: "" for field in ARTICLE_FIELDS}
+    for field, value in fields.items():
+        article[field] = value if value is not None else ""
+    article["content_hash"] = compute_hash(article)
+    return article
+
+
+class ProviderAdapter:
+    """Base adapter: query building, pagination, normalization and quota metadata"""
+
+    name = None
+    label = None
+    max_page_size = 50
+    daily_quota = None          # requests/day allowed by the provider tier
+    requests_per_second = 1.0   # client-side rate limit
+
+    def __init__(self, api_key=None, max_pages=1, page_size=None, label=None, **options):
+        self.api_key = api_key
+        self.max_pages = max_pages
+        self.page_size = page_size or self.max_page_size
+        if label:
+            self.label = label
+        self.label = self.label or self.name
+        self.options = options
+
+    # Query building and pagination
+
+    def format_query(self, query):
+        """Query string sent to the provider"""
+        tokens = query.split()
+        if '"' in query or "(" in query or set(tokens) & {"AND", "OR", "NOT"} or any(t[0] in "+-" for t in tokens):
+            # Advanced syntax is understood by the provider search as well
+            return query
+        return f'"{query}"'  # Use quotes for exact phrase matching
+
+    def build_request(self, query, from_date, page_size, cursor):
+        """Return (url, params) for one page of results"""
+        raise NotImplementedError
+
+    def extract_items(self, data):
+        """Return the list of raw articles contained in a page"""
+        raise NotImplementedError
+
+    def next_cursor(self, data, cursor, page_size):
+        """Return the cursor for the following page, or None when exhausted"""
+        return None
+
+    def fetch_page(self, query, from_date, page_size, cursor):
+        """Fetch one page of raw provider data"""
+        url, params = self.build_request(query, from_date, page_size, cursor)
+        response = http_get(url, params=params)
+        if response.status_code != 200:
+            raise ProviderError(f"{self.label} error: {response.status_code}")
+        return response.json()
+
+    def cache_key(self, query, from_date, page_size, cursor):
+        """Key identifying a page for response caching"""
+        return (self.name, self.label, query, from_date, page_size, str(cursor))
+
+    # Normalization
+
+    def normalize(self, raw):
+        """Convert a raw provider article into the common schema (None to skip)"""
+        raise NotImplementedError
+
+    # Quota metadata
+
+    def quota(self):
+        """Describe the provider's request allowance"""
+        return {
+            "provider": self.name,
+            "label": self.label,
+            "daily_requests": self.daily_quota,
+            "max_page_size": self.max_page_size,
+            "max_pages": self.max_pages,
+        }
+
+
+@register_provider("newsapi")
+class NewsAPIAdapter(ProviderAdapter):
+    """NewsAPI.org /v2/everything"""
+
+    label = "NewsAPI"
+    url = "https://newsapi.org/v2/everything"
+    max_page_size = 100
+    daily_quota = 1000
+
+    def build_request(self, query, from_date, page_size, cursor):
+        params = {
+            "q": self.format_query(query),
+            "from": from_date,
+            "sortBy": "relevancy",
+            "pageSize": page_size,
+            "page": cursor or 1,
+            "apiKey": self.api_key,
+            "language": "en"
+        }
+        return self.url, params
+
+    def extract_items(self, data):
+        return data.get("articles", [])
+
+    def next_cursor(self, data, cursor, page_size):
+        page = cursor or 1
+        if page * page_size < data.get("totalResults", 0):
+            return page + 1
+        return None
+
+    def normalize(self, raw):
+        if not (raw.get("title") and raw.get("description")):
+            return None
+        return make_article(
+            title=raw["title"],
+            description=raw["description"],
+            source_name=(raw.get("source") or {}).get("name", "Unknown"),
+            source_api=self.name,
+            published_at=raw.get("publishedAt", ""),
+            url=raw.get("url", ""),
+            author=raw.get("author", ""),
+            content=raw.get("content", "")
+        )
+
+
+@register_provider("guardian")
+class GuardianAdapter(ProviderAdapter):
+    """The Guardian content API /search"""
+
+    label = "Guardian API"
+    url = "https://content.guardianapis.com/search"
+    max_page_size = 50
+    daily_quota = 12000
+    requests_per_second = 5.0
+
+    def build_request(self, query, from_date, page_size, cursor):
+        params = {
+            "q": self.format_query(query),
+            "from-date": from_date,
+            "order-by": "relevance",
+            "page-size": page_size,
+            "page": cursor or 1,
+            "api-key": self.api_key,
+            "show-fields": "trailText,byline,bodyText"
+        }
+        return self.url, params
+
+    def extract_items(self, data):
+        return data.get("response", {}).get("results", [])
+
+    def next_cursor(self, data, cursor, page_size):
+        page = cursor or 1
+        if page < data.get("response", {}).get("pages", 0):
+            return page + 1
+        return None
+
+    def normalize(self, raw):
+        if not raw.get("webTitle"):
+            return None
+        fields = raw.get("fields", {})
+        return make_article(
+            title=raw.get("webTitle", ""),
+            description=fields.get("trailText", ""),
+            source_name="The Guardian",
+            source_api=self.name,
+            published_at=raw.get("webPublicationDate", ""),
+            url=raw.get("webUrl", ""),
+            author=fields.get("byline", ""),
+            content=fields.get("bodyText", "")
+        )
+
+
+@register_provider("newsdata")
+class NewsDataAdapter(ProviderAdapter):
+    """NewsData.io /api/1/news (token-based pagination, no date filter on free tier)"""
+
+    label = "NewsData API"
+    url = "https://newsdata.io/api/1/news"
+    max_page_size = 50
+    daily_quota = 200
+
+    def build_request(self, query, from_date, page_size, cursor):
+        params = {
+            "q": self.format_query(query),
+            "language": "en",
+            "size": page_size,
+            "apikey": self.api_key
+        }
+        if cursor:
+            params["page"] = cursor
+        return self.url, params
+
+    def extract_items(self, data):
+        return data.get("results", [])
+
+    def next_cursor(self, data, cursor, page_size):
+        return data.get("nextPage") or None
+
+    def normalize(self, raw):
+        if not (raw.get("title") and raw.get("description")):
+            return None
+        return make_article(
+            title=raw["title"],
+            description=raw["description"],
+            source_name=raw.get("source_id", "Unknown"),
+            source_api=self.name,
+            published_at=raw.get("pubDate", ""),
+            url=raw.get("link", ""),
+            author=", ".join(raw.get("creator", [])) if raw.get("creator") else "",
+            content=raw.get("content", "")
+        )
+
+
+@register_provider("rss")
+class RSSAdapter(ProviderAdapter):
+    """RSS 2.0 feeds; one feed URL per page, filtered locally by the query"""
+
+    label = "RSS Feeds"
+    daily_quota = None
+    requests_per_second = 2.0
+
+    def __init__(self, feeds=None, **kwargs):
+        super().__init__(**kwargs)
+        self.feeds = list(feeds or [])
+        self.max_pages = len(self.feeds)
+
+    def build_request(self, query, from_date, page_size, cursor):
+        return self.feeds[cursor or 0], None
+
+    def fetch_page(self, query, from_date, page_size, cursor):
+        url, _ = self.build_request(query, from_date, page_size, cursor)
+        response = http_get(url, headers={"Accept": "application/rss+xml, application/xml, text/xml"})
+        if response.status_code != 200:
+            raise ProviderError(f"RSS error for {url}: {response.status_code}")
+        channel = ET.fromstring(response.content).find("channel")
+        if channel is None:
+            return {"source": url, "items": []}
+        source = channel.findtext("title") or url
+        return {"source": source, "items": [(source, item) for item in channel.iter("item")]}
+
+    def extract_items(self, data):
+        return data["items"]
+
+    def next_cursor(self, data, cursor, page_size):
+        following = (cursor or 0) + 1
+        return following if following < len(self.feeds) else None
+
+    def normalize(self, raw):
+        source, item = raw
+        title = item.findtext("title")
+        if not title:
+            return None
+        published = item.findtext("pubDate") or ""
+        try:
+            published = parsedate_to_datetime(published).isoformat()
+        except (TypeError, ValueError):
+            pass
+        return make_article(
+            title=title.strip(),
+            description=(item.findtext("description") or "").strip(),
+            source_name=source,
+            source_api=self.name,
+            published_at=published,
+            url=item.findtext("link") or "",
+            author=item.findtext("author") or item.findtext("{http://purl.org/dc/elements/1.1/}creator") or "",
+            content=item.findtext("{http://purl.org/rss/1.0/modules/content/}encoded") or ""
+        )
+
+
+@register_provider("jsonl")
+class JSONLDumpAdapter(ProviderAdapter):
+    """Local JSONL dump of articles already in (or close to) the common schema"""
+
+    label = "Local JSONL"
+    max_page_size = 500
+    requests_per_second = None
+
+    def __init__(self, path=None, field_map=None, **kwargs):
+        kwargs.setdefault("max_pages", None)
+        super().__init__(**kwargs)
+        self.path = Path(path) if path else None
+        self.field_map = field_map or {}
+
+    def fetch_page(self, query, from_date, page_size, cursor):
+        # The cursor is a byte offset, so each page resumes without rescanning the file
+        items = []
+        with open(self.path, "rb") as handle:
+            handle.seek(cursor or 0)
+            while len(items) < page_size:
+                line = handle.readline()
+                if not line:
+                    break
+                if line.strip():
+                    items.append(json.loads(line))
+            offset = handle.tell()
+        return {"items": items, "offset": offset}
+
+    def cache_key(self, query, from_date, page_size, cursor):
+        # Local files are cheap to re-read and may change between runs
+        return None
+
+    def extract_items(self, data):
+        return data["items"]
+
+    def next_cursor(self, data, cursor, page_size):
+        if len(data["items"]) < page_size:
+            return None
+        return data["offset"]
+
+    def normalize(self, raw):
+        record = {field: raw.get(self.field_map.get(field, field), "") for field in ARTICLE_FIELDS}
+        if not record["title"]:
+            return None
+        record["source_api"] = record["source_api"] or self.name
+        record["source_name"] = record["source_name"] or "Unknown"
+        return make_article(**record)
+
+
+def create_provider(name, settings):
+    """Instantiate one adapter from its config entry"""
+    settings = dict(settings)
+    settings.pop("enabled", None)
+    adapter_name = settings.pop("adapter", name)
+    if adapter_name not in PROVIDER_REGISTRY:
+        raise KeyError(f"Unknown provider adapter: {adapter_name}")
+    return PROVIDER_REGISTRY[adapter_name](**settings)
+
+
+def load_providers(config=None):
+    """Instantiate every enabled adapter described in config/providers.py"""
+    if config is None:
+        from config.providers import PROVIDERS
+        config = PROVIDERS
+    return [
+        create_provider(name, settings)
+        for name, settings in config.items()
+        if settings.get("enabled", True)
+    ]
@@ -0,0 +1,3 @@
+"""
+Streaming exports for articles, relationships and graphs
+"""
@@ -0,0 +1,232 @@
+"""
+Streaming export writers
+Every writer consumes its input in fixed-size chunks and writes straight to
+a file, so exporting a large corpus or a million-edge graph never builds the
+whole output in memory.
+"""
+import csv
+import gzip
+import re
+from pathlib import Path
+from xml.sax.saxutils import escape, quoteattr
+
+import numpy as np
+import pandas as pd
+
+from src.data_collection.providers import ARTICLE_FIELDS
+
+DEFAULT_CHUNK_SIZE = 50000
+
+# Relationship columns written to edge tables; titles/sources/dates live in
+# the articles export and are joined on article id instead of repeated per edge
+EDGE_FIELDS = ["article1_id", "article2_id", "type", "strength", "evidence", "method"]
+
+ARTICLE_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "Compressed CSV": ("csv.gz", "application/gzip"),
+    "Parquet": ("parquet", "application/octet-stream"),
+}
+
+RELATIONSHIP_FORMATS = dict(ARTICLE_FORMATS)
+
+# Characters XML 1.0 does not allow, even escaped
+_invalid_xml = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]")
+
+GRAPH_FORMATS = {
+    "GraphML": ("graphml", "application/xml"),
+    "GEXF": ("gexf", "application/xml"),
+    "Edge list (NPZ)": ("npz", "application/octet-stream"),
+}
+
+
+def _open_text_output(path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix == ".gz":
+        return gzip.open(path, "wt", encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def _chunks(records, chunk_size):
+    """Group any iterable of dicts into lists of at most `chunk_size`"""
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _frame_chunks(df, chunk_size):
+    for start in range(0, len(df), chunk_size):
+        yield df.iloc[start:start + chunk_size]
+
+
+def _write_csv_records(records, path, fields, chunk_size):
+    with _open_text_output(path) as handle:
+        writer = csv.DictWriter(handle, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+        count = 0
+        for chunk in _chunks(records, chunk_size):
+            writer.writerows(chunk)
+            count += len(chunk)
+    return count
+
+
+def _write_parquet_records(records, path, fields, chunk_size, schema):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+    with pq.ParquetWriter(str(path), schema, compression="zstd") as writer:
+        for chunk in _chunks(records, chunk_size):
+            columns = {field: [record.get(field) for record in chunk] for field in fields}
+            writer.write_table(pa.table(columns, schema=schema))
+            count += len(chunk)
+    return count
+
+
+def _text_or_none(value):
+    """String form of a cell, keeping missing values (None/NaN/NaT) as nulls"""
+    if value is None or (pd.api.types.is_scalar(value) and pd.isna(value)):
+        return None
+    return str(value)
+
+
+def export_articles(articles_df, path, fmt="csv", chunk_size=DEFAULT_CHUNK_SIZE):
+    """Write the articles table in chunks; returns the number of rows written
+
+    The leading `id` column is the row position that article1_id/article2_id
+    refer to in the relationship and graph exports.
+    """
+    columns = [c for c in ARTICLE_FIELDS if c in articles_df.columns]
+    columns += [c for c in articles_df.columns if c not in columns and c != "id"]
+    articles_df = articles_df[columns].reset_index(drop=True).rename_axis("id")
+
+    if fmt == "parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        # One fixed schema, so chunks with all-missing columns still match
+        schema = pa.schema([("id", pa.int64())] + [(str(c), pa.string()) for c in columns])
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with pq.ParquetWriter(str(path), schema, compression="zstd") as writer:
+            for chunk in _frame_chunks(articles_df, chunk_size):
+                arrays = [pa.array(chunk.index.to_numpy(dtype=np.int64))]
+                arrays += [pa.array([_text_or_none(v) for v in chunk[c]], type=pa.string()) for c in columns]
+                writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+        return len(articles_df)
+
+    with _open_text_output(path) as handle:
+        for index, chunk in enumerate(_frame_chunks(articles_df, chunk_size)):
+            chunk.to_csv(handle, header=index == 0)
+    return len(articles_df)
+
+
+def export_relationships(relationships, path, fmt="csv", chunk_size=DEFAULT_CHUNK_SIZE):
+    """Write the edge table (ids, type, strength, evidence) in chunks"""
+    if fmt == "parquet":
+        import pyarrow as pa
+
+        schema = pa.schema([
+            ("article1_id", pa.int64()),
+            ("article2_id", pa.int64()),
+            ("type", pa.string()),
+            ("strength", pa.float32()),
+            ("evidence", pa.string()),
+            ("method", pa.string()),
+        ])
+        return _write_parquet_records(relationships, path, EDGE_FIELDS, chunk_size, schema)
+    return _write_csv_records(relationships, path, EDGE_FIELDS, chunk_size)
+
+
+def _node_attributes(articles_df):
+    """Yield (node_id, title, source, date) as XML-safe text, without materializing row dicts"""
+    def column(name):
+        if name not in articles_df:
+            return [""] * len(articles_df)
+        return articles_df[name].fillna("").astype(str).str.replace(_invalid_xml, "", regex=True)
+
+    for node_id, (title, source, date) in enumerate(zip(column("title"), column("source_name"),
+                                                        column("published_at"))):
+        yield node_id, title, source, date
+
+
+def export_graphml(articles_df, relationships, path):
+    """Stream the article graph as GraphML (readable by Gephi and networkx.read_graphml)"""
+    with _open_text_output(path) as handle:
+        handle.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        handle.write('<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n')
+        handle.write('  <key id="title" for="node" attr.name="title" attr.type="string"/>\n')
+        handle.write('  <key id="source" for="node" attr.name="source" attr.type="string"/>\n')
+        handle.write('  <key id="date" for="node" attr.name="date" attr.type="string"/>\n')
+        handle.write('  <key id="weight" for="edge" attr.name="weight" attr.type="double"/>\n')
+        handle.write('  <key id="type" for="edge" attr.name="type" attr.type="string"/>\n')
+        handle.write('  <graph id="NewsGraph" edgedefault="undirected">\n')
+        for node_id, title, source, date in _node_attributes(articles_df):
+            handle.write(
+                f'    <node id="n{node_id}"><data key="title">{escape(title)}</data>'
+                f'<data key="source">{escape(source)}</data><data key="date">{escape(date)}</data></node>\n'
+            )
+        for rel in relationships:
+            handle.write(
+                f'    <edge source="n{rel["article1_id"]}" target="n{rel["article2_id"]}">'
+                f'<data key="weight">{rel["strength"]:.6f}</data>'
+                f'<data key="type">{escape(rel["type"])}</data></edge>\n'
+            )
+        handle.write("  </graph>\n</graphml>\n")
+    return len(relationships)
+
+
+def export_gexf(articles_df, relationships, path):
+    """Stream the article graph as GEXF 1.3"""
+    with _open_text_output(path) as handle:
+        handle.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        handle.write('<gexf xmlns="http://gexf.net/1.3" version="1.3">\n')
+        handle.write('  <graph defaultedgetype="undirected">\n')
+        handle.write('    <attributes class="node">\n')
+        handle.write('      <attribute id="0" title="source" type="string"/>\n')
+        handle.write('      <attribute id="1" title="date" type="string"/>\n')
+        handle.write('    </attributes>\n')
+        handle.write('    <nodes>\n')
+        for node_id, title, source, date in _node_attributes(articles_df):
+            handle.write(
+                f'      <node id="{node_id}" label={quoteattr(title)}><attvalues>'
+                f'<attvalue for="0" value={quoteattr(source)}/><attvalue for="1" value={quoteattr(date)}/>'
+                f'</attvalues></node>\n'
+            )
+        handle.write('    </nodes>\n    <edges>\n')
+        for edge_id, rel in enumerate(relationships):
+            handle.write(
+                f'      <edge id="{edge_id}" source="{rel["article1_id"]}" target="{rel["article2_id"]}" '
+                f'weight="{rel["strength"]:.6f}" label={quoteattr(rel["type"])}/>\n'
+            )
+        handle.write('    </edges>\n  </graph>\n</gexf>\n')
+    return len(relationships)
+
+
+def export_edgelist_npz(relationships, path, num_nodes=None):
+    """Compact edge list: int32 source/target and float32 weight arrays"""
+    count = len(relationships)
+    source = np.fromiter((rel["article1_id"] for rel in relationships), dtype=np.int32, count=count)
+    target = np.fromiter((rel["article2_id"] for rel in relationships), dtype=np.int32, count=count)
+    weight = np.fromiter((rel["strength"] for rel in relationships), dtype=np.float32, count=count)
+    if num_nodes is None:
+        num_nodes = int(max(source.max(initial=-1), target.max(initial=-1)) + 1)
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(path, source=source, target=target, weight=weight, num_nodes=np.int64(num_nodes))
+    return count
+
+
+def export_graph(articles_df, relationships, path, fmt):
+    """Dispatch to the graph writer for `fmt` (graphml, gexf or npz)"""
+    if fmt == "graphml":
+        return export_graphml(articles_df, relationships, path)
+    if fmt == "gexf":
+        return export_gexf(articles_df, relationships, path)
+    if fmt == "npz":
+        return export_edgelist_npz(relationships, path, num_nodes=len(articles_df))
+    raise ValueError(f"Unsupported graph format: {fmt}")
@@ -0,0 +1,276 @@
+"""
+Local job queue
+Heavy work (collection, analysis) runs on a worker pool instead of the
+Streamlit script thread. Jobs are identified by a hash of their parameters,
+so identical requests from different sessions share one run and one result.
+Job state and progress live in SQLite; results are pickled next to it.
+Every job row records the process that owns it, and that process refreshes
+its jobs' heartbeat while it lives, so a restarted server (or a second one
+sharing the directory) only fails jobs whose owner is gone.
+"""
+import hashlib
+import json
+import os
+import pickle
+import socket
+import sqlite3
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+
+DEFAULT_JOB_DIR = Path(__file__).resolve().parents[2] / "data" / "processed" / "jobs"
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+# Minimum seconds between progress writes from one job
+PROGRESS_INTERVAL = 0.25
+
+# Finished results kept unpickled in memory
+RESULT_CACHE_SIZE = 16
+
+# Finished job rows (and their pickled results) kept on disk
+MAX_FINISHED_JOBS = 200
+
+# Seconds between heartbeats of a live process, and without one before its
+# queued or running jobs are considered orphaned
+HEARTBEAT_INTERVAL = 5.0
+HEARTBEAT_TIMEOUT = 60.0
+
+
+def frame_fingerprint(df, columns=None):
+    """Stable digest of a DataFrame's contents (used in job parameters)"""
+    columns = [c for c in (columns or df.columns) if c in df.columns]
+    hashed = pd.util.hash_pandas_object(df[columns].astype(str), index=False).to_numpy()
+    return hashlib.blake2b(hashed.tobytes(), digest_size=12).hexdigest()
+
+
+def job_id(kind, params):
+    """Job identity: kind plus canonical JSON of its parameters"""
+    canonical = json.dumps({"kind": kind, "params": params}, sort_keys=True, default=str)
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=12).hexdigest()
+
+
+class JobQueue:
+    """SQLite-backed job registry with a thread worker pool"""
+
+    def __init__(self, directory=DEFAULT_JOB_DIR, max_workers=2):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.directory / "jobs.sqlite"
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="newsgraph-job")
+        self.tasks = {}
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._lock = threading.Lock()
+        self._results = OrderedDict()
+        self._results_lock = threading.Lock()
+        self._init_db()
+        self._heartbeat = threading.Thread(target=self._beat, daemon=True, name="newsgraph-job-heartbeat")
+        self._heartbeat.start()
+
+    # Storage
+
+    @contextmanager
+    def _connect(self):
+        connection = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    def _init_db(self):
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                """CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    progress REAL NOT NULL DEFAULT 0,
+                    message TEXT NOT NULL DEFAULT '',
+                    error TEXT,
+                    created REAL NOT NULL,
+                    updated REAL NOT NULL,
+                    owner TEXT
+                )"""
+            )
+            columns = {row["name"] for row in connection.execute("PRAGMA table_info(jobs)")}
+            if "owner" not in columns:
+                connection.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+            rows = connection.execute(
+                "SELECT * FROM jobs WHERE status IN (?, ?)", (QUEUED, RUNNING)
+            ).fetchall()
+            known = {row["id"] for row in connection.execute("SELECT id FROM jobs")}
+
+        for row in rows:
+            self._recover(dict(row))
+        # Results whose job row is gone (e.g. deleted by another process mid-write)
+        for path in list(self.directory.glob("*.pkl")) + list(self.directory.glob("*.tmp")):
+            if path.stem not in known:
+                path.unlink(missing_ok=True)
+
+    def _owner_alive(self, owner, heartbeat):
+        """Whether the process that owns a job can still finish it"""
+        if not owner or time.time() - heartbeat > HEARTBEAT_TIMEOUT:
+            return False
+        host, _, pid = owner.rpartition(":")
+        if owner == self.owner or host != socket.gethostname() or os.name == "nt":
+            return True
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            return False
+        except (PermissionError, ValueError):
+            pass
+        return True
+
+    def _recover(self, job):
+        """Fail a queued or running job whose owner died; True when it was failed"""
+        if self._owner_alive(job.get("owner"), job["updated"]):
+            return False
+        with self._connect() as connection:
+            connection.execute(
+                "UPDATE jobs SET status = ?, error = ?, message = ? WHERE id = ? AND status IN (?, ?) AND updated = ?",
+                (FAILED, "interrupted: the process running it stopped", "interrupted",
+                 job["id"], QUEUED, RUNNING, job["updated"]),
+            )
+        return True
+
+    def _beat(self):
+        """Refresh the heartbeat of this process's unfinished jobs"""
+        while True:
+            time.sleep(HEARTBEAT_INTERVAL)
+            try:
+                with self._connect() as connection:
+                    connection.execute(
+                        "UPDATE jobs SET updated = ? WHERE owner = ? AND status IN (?, ?)",
+                        (time.time(), self.owner, QUEUED, RUNNING),
+                    )
+            except sqlite3.Error:
+                pass
+
+    def _evict(self):
+        """Drop the oldest finished jobs beyond MAX_FINISHED_JOBS, with their results"""
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT id FROM jobs WHERE status IN (?, ?) ORDER BY updated DESC LIMIT -1 OFFSET ?",
+                (DONE, FAILED, MAX_FINISHED_JOBS),
+            ).fetchall()
+            identifiers = [row["id"] for row in rows]
+            connection.executemany(
+                "DELETE FROM jobs WHERE id = ? AND status IN (?, ?)",
+                [(identifier, DONE, FAILED) for identifier in identifiers],
+            )
+        for identifier in identifiers:
+            self._result_path(identifier).unlink(missing_ok=True)
+
+    def _update(self, identifier, **fields):
+        fields["updated"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._connect() as connection:
+            connection.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), identifier))
+
+    def _result_path(self, identifier):
+        return self.directory / f"{identifier}.pkl"
+
+    # Public API
+
+    def register(self, kind, function, ttl=None):
+        """Declare a job kind: function(payload, report) -> result
+
+        `report(fraction, message)` publishes progress. Finished results
+        older than `ttl` seconds are recomputed on the next submit.
+        """
+        self.tasks[kind] = (function, ttl)
+
+    def submit(self, kind, params, payload=None):
+        """Start a job unless an identical one is running or has a fresh result
+
+        `params` (JSON-serializable) define the job identity; `payload` holds
+        the inputs themselves and is not hashed.
+        """
+        function, ttl = self.tasks[kind]
+        identifier = job_id(kind, params)
+
+        with self._lock:
+            current = self.status(identifier)
+            if current is not None:
+                fresh = ttl is None or time.time() - current["updated"] < ttl
+                if current["status"] in (QUEUED, RUNNING) and not self._recover(current):
+                    return identifier
+                if current["status"] == DONE and fresh and self._result_path(identifier).exists():
+                    return identifier
+
+            now = time.time()
+            with self._connect() as connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO jobs "
+                    "(id, kind, params, status, progress, message, error, created, updated, owner) "
+                    "VALUES (?, ?, ?, ?, 0, 'queued', NULL, ?, ?, ?)",
+                    (identifier, kind, json.dumps(params, sort_keys=True, default=str), QUEUED, now, now,
+                     self.owner),
+                )
+            with self._results_lock:
+                self._results.pop(identifier, None)
+            self.executor.submit(self._run, identifier, function, payload)
+        return identifier
+
+    def _run(self, identifier, function, payload):
+        self._update(identifier, status=RUNNING, message="started")
+        last_report = [0.0]
+
+        def report(fraction, message=""):
+            now = time.monotonic()
+            if now - last_report[0] >= PROGRESS_INTERVAL or fraction >= 1.0:
+                last_report[0] = now
+                self._update(identifier, progress=float(min(max(fraction, 0.0), 1.0)), message=message)
+
+        try:
+            result = function(payload, report)
+            partial = self._result_path(identifier).with_suffix(".tmp")
+            with open(partial, "wb") as handle:
+                pickle.dump(result, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            partial.replace(self._result_path(identifier))
+            self._remember(identifier, result)
+            self._update(identifier, status=DONE, progress=1.0, message="completed")
+        except Exception as e:
+            self._update(identifier, status=FAILED, error=f"{e}\n{traceback.format_exc(limit=5)}", message=str(e))
+        self._evict()
+
+    def status(self, identifier):
+        """Job record as a dict, or None when unknown"""
+        with self._connect() as connection:
+            row = connection.execute("SELECT * FROM jobs WHERE id = ?", (identifier,)).fetchone()
+        return dict(row) if row else None
+
+    def result(self, identifier):
+        """Result of a finished job (shared in memory across sessions)"""
+        with self._results_lock:
+            if identifier in self._results:
+                self._results.move_to_end(identifier)
+                return self._results[identifier]
+        with open(self._result_path(identifier), "rb") as handle:
+            result = pickle.load(handle)
+        self._remember(identifier, result)
+        return result
+
+    def _remember(self, identifier, result):
+        with self._results_lock:
+            self._results[identifier] = result
+            while len(self._results) > RESULT_CACHE_SIZE:
+                self._results.popitem(last=False)
+
+    def active_jobs(self):
+        """Jobs currently queued or running, oldest first"""
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT * FROM jobs WHERE status IN (?, ?) ORDER BY created", (QUEUED, RUNNING)
+            ).fetchall()
+        return [dict(row) for row in rows]
@@ -0,0 +1,89 @@
+"""
+Job functions for the dashboard
+Each task takes a payload and a progress callback and returns a picklable
+result; none of them touch Streamlit.
+"""
+import threading
+import time
+
+from src.analysis.entities import EntityExtractor, EntityIndex
+from src.analysis.memory import MemoryBudget, RSSMonitor
+from src.analysis.relationships import analyze_relationships
+from src.data_collection.collector import collect_articles
+
+# Collected articles go stale; analysis results depend only on their inputs
+COLLECTION_TTL = 900
+
+_extractor = None
+_extractor_lock = threading.Lock()
+
+
+def get_entity_extractor():
+    """Shared spaCy NER pipeline (loaded once per server process)"""
+    global _extractor
+    with _extractor_lock:
+        if _extractor is None:
+            _extractor = EntityExtractor()
+    return _extractor
+
+
+def collection_task(payload, report):
+    """Collect articles from the given providers"""
+    def on_progress(done, total, label):
+        report(done / total, f"Finished {label} ({done}/{total})")
+
+    report(0.0, "Collecting from all providers...")
+    articles, provider_report = collect_articles(
+        payload["query"],
+        payload["from_date"],
+        payload["max_articles"],
+        payload["providers"],
+        progress_callback=on_progress,
+    )
+    return {"articles": articles, "report": provider_report}
+
+
+def analysis_task(payload, report):
+    """Entity extraction (optional) followed by relationship detection"""
+    articles_df = payload["articles_df"]
+    methods = payload["methods"]
+    warnings = []
+    entity_index = None
+    memory_limit = payload.get("memory_limit")
+    ner_options = MemoryBudget(memory_limit).ner_options() if memory_limit else {}
+
+    # RSS is process-wide, so concurrent jobs show up in each other's peak
+    with RSSMonitor() as monitor:
+        if "Entity Overlap" in methods:
+            report(0.1, "Extracting entities...")
+            try:
+                article_entities = get_entity_extractor().extract(articles_df.to_dict('records'), **ner_options)
+                entity_index = EntityIndex(article_entities)
+            except Exception as e:
+                warnings.append(f"Entity extraction unavailable: {str(e)}")
+
+        report(0.4, "Comparing articles...")
+        relationships = analyze_relationships(
+            articles_df,
+            payload["threshold"],
+            methods,
+            entity_index=entity_index,
+            date_range=payload.get("date_range"),
+            memory_limit=memory_limit,
+            **payload.get("pruning", {})
+        )
+
+    return {
+        "relationships": relationships,
+        "entity_index": entity_index,
+        "warnings": warnings,
+        "peak_rss": monitor.peak,
+        "finished_at": time.time(),
+    }
+
+
+def register_tasks(queue):
+    """Register every dashboard job kind on a queue"""
+    queue.register("collection", collection_task, ttl=COLLECTION_TTL)
+    queue.register("analysis", analysis_task)
+    return queue